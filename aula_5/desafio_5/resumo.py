@@ -0,0 +1,106 @@
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from comum.colunar import ler_tabela, versao_arquivo
+from comum.estatistica import descrever
+from comum.streaming import (Amostra, CoMomentos, Contagens, Extremos, Momentos,
+                             resumo_descritivo, usar_streaming, varrer)
+
+ARQUIVO = 'aula_5/desafio_5/dados_alunos_escola.csv'
+COLUNAS = ['serie', 'nota_matematica', 'nota_portugues', 'nota_ciencias', 'frequencia_%', 'cidade']
+NOTAS = {'nota_matematica': 'Matemática', 'nota_portugues': 'Português', 'nota_ciencias': 'Ciências'}
+# Notas têm uma casa decimal: a moda é contada em passos de 0.1 (exata)
+PASSO_NOTAS = 0.1
+LIMITE_FREQUENCIA = 75
+
+
+class Resumo(NamedTuple):
+    """Tudo o que a página mostra, calculado do DataFrame inteiro ou do CSV em blocos."""
+    alunos: int
+    estatisticas: pd.DataFrame        # uma linha por matéria (campos de comum.estatistica)
+    frequencia_por_serie: pd.Series
+    baixa_frequencia: tuple           # (alunos, média geral das notas)
+    medias_por_cidade: pd.DataFrame
+    contagem_notas: dict              # matéria -> frequência de cada nota
+    alunos_por_cidade: pd.Series
+    melhores: dict                    # matéria -> linha (cidade, nota)
+    piores: dict
+    correlacao_frequencia: pd.Series  # frequência × cada matéria
+    amostra: pd.DataFrame             # linhas para os gráficos de distribuição e dispersão
+
+
+def _media_notas(df: pd.DataFrame) -> pd.Series:
+    return df[list(NOTAS)].mean(axis=1)
+
+
+def resumir(df: pd.DataFrame) -> Resumo:
+    baixa = df[df['frequencia_%'] < LIMITE_FREQUENCIA]
+    return Resumo(
+        alunos=len(df),
+        estatisticas=descrever(df, list(NOTAS), passos={c: PASSO_NOTAS for c in NOTAS}),
+        frequencia_por_serie=df.groupby('serie')['frequencia_%'].mean(),
+        baixa_frequencia=(len(baixa), _media_notas(baixa).mean()),
+        medias_por_cidade=df.groupby('cidade')[list(NOTAS)].mean(),
+        contagem_notas={c: df[c].value_counts() for c in NOTAS},
+        alunos_por_cidade=df['cidade'].value_counts(),
+        melhores={c: df.loc[df[c].idxmax(), ['cidade', c]] for c in NOTAS},
+        piores={c: df.loc[df[c].idxmin(), ['cidade', c]] for c in NOTAS},
+        correlacao_frequencia=df[['frequencia_%', *NOTAS]].corr()['frequencia_%'].loc[list(NOTAS)],
+        amostra=df,
+    )
+
+
+def _preparar(bloco: pd.DataFrame) -> pd.DataFrame:
+    bloco['frequencia_baixa'] = bloco['frequencia_%'] < LIMITE_FREQUENCIA
+    bloco['media_notas'] = _media_notas(bloco)
+    return bloco
+
+
+def resumir_em_blocos(path: str) -> Resumo:
+    """O mesmo ``Resumo`` lendo o CSV em blocos, sem carregar o arquivo inteiro.
+
+    Médias, contagens e extremos são exatos; gráficos de distribuição e de
+    dispersão usam uma amostra aleatória das linhas.
+    """
+    notas = Momentos(list(NOTAS))
+    por_serie = Momentos(['frequencia_%'], grupo='serie')
+    por_cidade = Momentos(list(NOTAS), grupo='cidade')
+    baixa = Momentos(['media_notas'], grupo='frequencia_baixa')
+    contagens = Contagens([*NOTAS, 'cidade', 'frequencia_baixa'])
+    extremos = Extremos(list(NOTAS), ['cidade'])
+    comomentos = CoMomentos(['frequencia_%', *NOTAS])
+    amostra = Amostra()
+    varrer(path, [notas, por_serie, por_cidade, baixa, contagens, extremos, comomentos, amostra],
+           colunas=COLUNAS, preparar=_preparar, sep=',', encoding='utf-8')
+
+    baixas = contagens.contagens('frequencia_baixa')
+    return Resumo(
+        alunos=amostra.vistas,
+        estatisticas=resumo_descritivo(notas, contagens=contagens),
+        frequencia_por_serie=por_serie.media['frequencia_%'].sort_index(),
+        baixa_frequencia=(int(baixas.get(True, 0)),
+                          baixa.media['media_notas'].get(True, np.nan)),
+        medias_por_cidade=por_cidade.media.sort_index(),
+        contagem_notas={c: contagens.contagens(c) for c in NOTAS},
+        alunos_por_cidade=contagens.contagens('cidade'),
+        melhores=extremos.maior,
+        piores=extremos.menor,
+        correlacao_frequencia=comomentos.correlacao()['frequencia_%'].loc[list(NOTAS)],
+        amostra=amostra.dados[COLUNAS],
+    )
+
+
+# Uma vez por versão do arquivo, compartilhado entre sessões (somente leitura)
+@st.cache_resource(show_spinner="Resumindo os dados dos alunos...", max_entries=2)
+def _carregar_resumo(path: str, versao: str) -> Resumo:
+    if usar_streaming(path):
+        return resumir_em_blocos(path)
+    # Só as colunas usadas pela página, lidas da cópia colunar do CSV
+    return resumir(ler_tabela(path, colunas=COLUNAS, sep=',', encoding='utf-8'))
+
+
+def carregar_resumo(path: str = ARQUIVO) -> Resumo:
+    return _carregar_resumo(path, versao_arquivo(path))
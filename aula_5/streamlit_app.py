@@ -1,8 +1,20 @@
+import sys
+from pathlib import Path
 import streamlit as st
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 
+# Raiz do repositório no sys.path, para importar o pacote comum/
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from comum.colunar import ler_tabela, versao_arquivo
+from comum.estatistica import estatisticas, linha_metricas
+from comum.faixas import Faixas
+from comum.graficos import mostrar_grafico
+from comum.streaming import (Amostra, CoMomentos, Contagens, Momentos, Quantis, resumo_descritivo,
+                             usar_streaming, varrer)
+
 # Configurações gerais da página
 st.set_page_config(
     page_title="Dashboard Estatístico",
@@ -22,39 +34,70 @@ st.markdown(
     """
 )
 
+# Faixa etária: até 25 anos Jovem, até 45 Adulto, acima disso Sênior
+FAIXAS_ETARIAS = Faixas((-np.inf, 25, 45, np.inf), ("Jovem", "Adulto", "Sênior"))
+
+
+def derivar_colunas(df: pd.DataFrame) -> pd.DataFrame:
+    # Cria coluna de faixa etária (categórica, de uma vez para a coluna inteira)
+    df["faixa_etaria"] = FAIXAS_ETARIAS.classificar(df["idade"])
+    return df
+
+
 # Carregamento de dados (com cache para performance)
 @st.cache_data
 def load_data(path: str) -> pd.DataFrame:
-    df = pd.read_csv(path, sep=",", encoding="utf-8")
-    # Cria coluna de faixa etária
-    def faixa_etaria(idade):
-        if idade <= 25:
-            return "Jovem"
-        elif idade <= 45:
-            return "Adulto"
-        else:
-            return "Sênior"
-    df["faixa_etaria"] = df["idade"].apply(faixa_etaria)
-    return df
+    # Leitura pela cópia colunar (Feather) do CSV
+    return derivar_colunas(ler_tabela(path, sep=",", encoding="utf-8"))
 
-df = load_data("aula_5/dados_estatistica_visualizacao.csv")
+# Arquivos grandes demais para a memória: lidos em blocos, com estatísticas
+# exatas, contagens só das colunas discretas, quantis do salário pelo t-digest
+# e uma amostra aleatória das linhas para os gráficos
+@st.cache_resource(show_spinner="Lendo o arquivo em blocos...", max_entries=2)
+def resumir_em_blocos(path: str, versao: str):
+    momentos = Momentos(['idade', 'salario'])
+    contagens = Contagens(['idade', 'estado'])
+    quantis = Quantis(['salario'])
+    comomentos = CoMomentos(['idade', 'salario'])
+    amostra = Amostra()
+    varrer(path, [momentos, contagens, quantis, comomentos, amostra], preparar=derivar_colunas,
+           sep=",", encoding="utf-8")
+    return (resumo_descritivo(momentos, quantis, contagens), contagens.contagens('estado'),
+            comomentos.correlacao().at['idade', 'salario'], amostra)
+
+ARQUIVO = "aula_5/dados_estatistica_visualizacao.csv"
+versao = versao_arquivo(ARQUIVO)
+streaming = usar_streaming(ARQUIVO)
+if streaming:
+    stats, contagem_estados, correlacao, amostra = resumir_em_blocos(ARQUIVO, versao)
+    # Daqui em diante ``df`` é a amostra: usada só nos gráficos e na prévia dos dados
+    df = amostra.dados
+else:
+    df = load_data(ARQUIVO)
+    # Todas as estatísticas das duas colunas de uma vez, em cache por versão do arquivo
+    stats = estatisticas(df, ('idade', 'salario'), versao)
+    contagem_estados = df["estado"].value_counts()
 
 # Estatísticas descritivas rápidas
 st.subheader("📈 Estatísticas Descritivas")
-col1, col2, col3, col4 = st.columns(4)
-col1.metric("Média Idade", f"{df['idade'].mean():.2f}")
-col2.metric("Mediana Idade", f"{df['idade'].median():.2f}")
-col3.metric("Moda Idade", f"{int(df['idade'].mode()[0])}")
-col4.metric("Variância Idade", f"{df['idade'].var():.2f}")
-
-col5, col6, col7, col8 = st.columns(4)
-col5.metric("Média Salário", f"{df['salario'].mean():.2f}")
-col6.metric("Mediana Salário", f"{df['salario'].median():.2f}")
-col7.metric("Moda Salário", f"{int(df['salario'].mode()[0])}")
-col8.metric("Amplitude Salário", f"{df['salario'].max() - df['salario'].min():.2f}")
+linha_metricas(stats.loc['idade'], [
+    ("Média Idade",       'media',     '{:.2f}'),
+    ("Mediana Idade",     'mediana',   '{:.2f}'),
+    ("Moda Idade",        'moda',      '{:.0f}'),
+    ("Variância Idade",   'variancia', '{:.2f}'),
+])
+linha_metricas(stats.loc['salario'], [
+    ("Média Salário",     'media',     '{:.2f}'),
+    ("Mediana Salário",   'mediana',   '{:.2f}'),
+    # Sem moda no modo em blocos (o salário é contínuo e não é contado valor a valor)
+    ("Moda Salário",      'moda',      lambda moda: "—" if np.isnan(moda) else f"{moda:.0f}"),
+    ("Amplitude Salário", 'amplitude', '{:.2f}'),
+])
 
 # Mostrar dados brutos (expansível)
 with st.expander("🗄️ Ver dados brutos"):
+    if streaming:
+        st.caption(f"Amostra aleatória de {len(df):,} de {amostra.vistas:,} linhas.")
     st.dataframe(df, use_container_width=True)
 
 # Separar gráficos em abas
@@ -65,42 +108,54 @@ tab1, tab2, tab3 = st.tabs([
 ])
 
 with tab1:
-    fig, ax = plt.subplots(figsize=(8, 4))
-    sns.countplot(
-        data=df,
-        x="estado",
-        order=df["estado"].value_counts().index,
-        ax=ax
-    )
-    ax.set_title("Distribuição por Estado")
-    ax.set_xlabel("Estado")
-    ax.set_ylabel("Frequência")
-    st.pyplot(fig)
+    def grafico_estados():
+        fig, ax = plt.subplots(figsize=(8, 4))
+        sns.barplot(
+            x=contagem_estados.index,
+            y=contagem_estados.values,
+            order=contagem_estados.index,
+            ax=ax
+        )
+        ax.set_title("Distribuição por Estado")
+        ax.set_xlabel("Estado")
+        ax.set_ylabel("Frequência")
+        return fig
+
+    mostrar_grafico(grafico_estados, versao, 'grafico_estados')
 
 with tab2:
-    fig, ax = plt.subplots(figsize=(8, 4))
-    sns.boxplot(
-        data=df,
-        x="departamento",
-        y="salario",
-        ax=ax
-    )
-    ax.set_title("Salário por Departamento")
-    ax.set_xlabel("Departamento")
-    ax.set_ylabel("Salário")
-    st.pyplot(fig)
+    def grafico_departamentos():
+        fig, ax = plt.subplots(figsize=(8, 4))
+        sns.boxplot(
+            data=df,
+            x="departamento",
+            y="salario",
+            ax=ax
+        )
+        ax.set_title("Salário por Departamento")
+        ax.set_xlabel("Departamento")
+        ax.set_ylabel("Salário")
+        return fig
+
+    mostrar_grafico(grafico_departamentos, versao, 'grafico_departamentos')
 
 with tab3:
-    fig, ax = plt.subplots(figsize=(8, 4))
-    sns.scatterplot(
-        data=df,
-        x="idade",
-        y="salario",
-        hue="departamento",
-        palette="tab10",
-        ax=ax
-    )
-    ax.set_title("Dispersão: Idade vs. Salário")
-    ax.set_xlabel("Idade")
-    ax.set_ylabel("Salário")
-    st.pyplot(fig)
+    if streaming:
+        st.caption(f"Amostra aleatória de {len(df):,} de {amostra.vistas:,} linhas. "
+                   f"Correlação idade × salário (todas as linhas): {correlacao:.2f}")
+    def grafico_dispersao():
+        fig, ax = plt.subplots(figsize=(8, 4))
+        sns.scatterplot(
+            data=df,
+            x="idade",
+            y="salario",
+            hue="departamento",
+            palette="tab10",
+            ax=ax
+        )
+        ax.set_title("Dispersão: Idade vs. Salário")
+        ax.set_xlabel("Idade")
+        ax.set_ylabel("Salário")
+        return fig
+
+    mostrar_grafico(grafico_dispersao, versao, 'grafico_dispersao')
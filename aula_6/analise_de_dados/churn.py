@@ -0,0 +1,101 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+# Quantil da normal para o intervalo de confiança de 95%
+Z_95 = 1.959963984540054
+
+
+def _codigos(serie: pd.Series):
+    # Códigos inteiros e valores de uma dimensão; -1 marca valor ausente
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        return serie.cat.codes.to_numpy(), serie.cat.categories
+    codigos, valores = pd.factorize(serie, sort=True)
+    return codigos, valores
+
+
+def agregar_churn(dimensoes: dict, cancelados: np.ndarray, mascara: np.ndarray = None,
+                  clientes: np.ndarray = None, z: float = Z_95) -> pd.DataFrame:
+    """Clientes, cancelados, taxa e IC de Wilson por combinação das dimensões.
+
+    ``dimensoes`` mapeia nome -> Series alinhadas com ``cancelados``. Os códigos
+    das dimensões são combinados em um único índice inteiro e as contagens
+    saem de dois ``np.bincount``: uma passada vetorizada, sem apply por grupo.
+    ``mascara`` (opcional) restringe as linhas consideradas. Com ``clientes``,
+    cada linha é uma célula já agregada (o cubo); sem ele, um cliente (churn_flag).
+    """
+    nomes = list(dimensoes)
+    pares = [_codigos(serie) for serie in dimensoes.values()]
+    codigos = [c for c, _ in pares]
+    valores = [v for _, v in pares]
+    formato = tuple(len(v) for v in valores)
+
+    validos = np.logical_and.reduce([c >= 0 for c in codigos])
+    if mascara is not None:
+        validos &= mascara
+    celula = np.ravel_multi_index([c[validos] for c in codigos], formato)
+    n_celulas = int(np.prod(formato))
+    pesos = None if clientes is None else clientes[validos]
+    clientes = np.bincount(celula, weights=pesos, minlength=n_celulas).astype(np.int64)
+    cancelados = np.bincount(celula, weights=cancelados[validos], minlength=n_celulas)
+
+    if len(nomes) == 1:
+        indice = pd.Index(valores[0], name=nomes[0])
+    else:
+        indice = pd.MultiIndex.from_product(valores, names=nomes)
+    resultado = pd.DataFrame({'clientes': clientes, 'cancelados': cancelados.astype(np.int64)}, index=indice)
+    resultado = resultado[resultado['clientes'] > 0]
+
+    # Intervalo de Wilson: se comporta bem em grupos pequenos e taxas perto de 0 ou 1
+    n = resultado['clientes'].to_numpy(dtype=float)
+    p = resultado['cancelados'].to_numpy(dtype=float) / n
+    denominador = 1 + z**2 / n
+    centro = (p + z**2 / (2 * n)) / denominador
+    margem = z * np.sqrt(p * (1 - p) / n + z**2 / (4 * n**2)) / denominador
+    resultado['taxa'] = p
+    resultado['ic_inf'] = centro - margem
+    resultado['ic_sup'] = centro + margem
+    return resultado
+
+
+def _somas(cubo: pd.DataFrame, colunas: list, mascara: np.ndarray) -> pd.Series:
+    # Soma das colunas do cubo nas células da máscara
+    return pd.Series(mascara.astype(np.float64) @ cubo[colunas].to_numpy(dtype=np.float64), index=colunas)
+
+
+def medias_por_churn(cubo: pd.DataFrame, fatores: list, mascara: np.ndarray) -> pd.DataFrame:
+    """Média de cada fator para clientes cancelados e ativos, a partir das somas do cubo."""
+    s = _somas(cubo, ['clientes', 'cancelados'] + [f'{f}|{m}' for f in fatores for m in ('soma', 'soma_churn')],
+               mascara)
+    n_churn, n_ativo = s['cancelados'], s['clientes'] - s['cancelados']
+    medias = {
+        f: [s[f'{f}|soma_churn'] / n_churn, (s[f'{f}|soma'] - s[f'{f}|soma_churn']) / n_ativo]
+        for f in fatores
+    }
+    return pd.DataFrame(medias, index=pd.Index(['Cancelado', 'Cliente'], name='Categoria'))
+
+
+def correlacao_churn(cubo: pd.DataFrame, fatores: list, mascara: np.ndarray) -> pd.Series:
+    """Correlação de Pearson de cada fator com churn_flag, a partir das somas do cubo."""
+    s = _somas(cubo, ['clientes', 'cancelados'] + [f'{f}|{m}' for f in fatores
+                                                   for m in ('soma', 'soma2', 'soma_churn')], mascara)
+    # churn_flag é 0/1: soma dos quadrados = soma = cancelados
+    n, sy = s['clientes'], s['cancelados']
+    resultado = {}
+    for f in fatores:
+        sx, sxx, sxy = s[f'{f}|soma'], s[f'{f}|soma2'], s[f'{f}|soma_churn']
+        cov = sxy - sx * sy / n
+        resultado[f] = cov / np.sqrt((sxx - sx**2 / n) * (sy - sy**2 / n))
+    return pd.Series(resultado)
+
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def taxa_churn(_cubo: pd.DataFrame, dimensoes: tuple, versao: str, filtro: tuple = (),
+               _mascara: np.ndarray = None) -> pd.DataFrame:
+    """Taxa de cancelamento por ``dimensoes``, somando as células do cubo.
+
+    Em cache por (dimensões, versão dos dados, filtro); ``filtro`` é a assinatura
+    hashável da seleção que gerou ``_mascara``.
+    """
+    return agregar_churn({d: _cubo[d] for d in dimensoes}, _cubo['cancelados'].to_numpy(), _mascara,
+                         clientes=_cubo['clientes'].to_numpy())
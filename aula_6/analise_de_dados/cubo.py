@@ -0,0 +1,94 @@
+import hashlib
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from comum.colunar import caminho_cache, gravar_feather, ler_feather
+from comum.streaming import TAMANHO_BLOCO, usar_streaming
+from dados import ARQUIVO_CLIENTES, COLUNAS, DTYPES, _carregar_clientes, derivar_colunas, versao_arquivo
+
+# Dimensões do cubo: as de baixa cardinalidade mais o tempo de casa em faixas (para o filtro)
+DIMENSOES = [
+    'Sexo', 'Categoria Cartão', 'Faixa Etária', 'Faixa Salarial Anual',
+    'Estado Civil', 'Educação', 'Faixa de Tempo',
+]
+# Indicadores com soma, soma dos quadrados e soma entre cancelados em cada célula,
+# o suficiente para médias por categoria e correlação de Pearson com o churn
+FATORES = ['Contatos 12m', 'Inatividade 12m', 'Taxa de Utilização Cartão', 'Produtos Contratados']
+
+
+def montar_cubo(df: pd.DataFrame) -> pd.DataFrame:
+    """Agrega os clientes em uma linha por combinação de ``DIMENSOES`` presente nos dados.
+
+    Cada célula guarda ``clientes``, ``cancelados`` e, para cada fator ``f``,
+    as colunas ``f|soma``, ``f|soma2`` e ``f|soma_churn``.
+    """
+    flag = df['churn_flag'].to_numpy(dtype=np.int64)
+    medidas = {'clientes': np.ones(len(df), dtype=np.int64), 'cancelados': flag}
+    for fator in FATORES:
+        x = df[fator].to_numpy(dtype=np.float64)
+        medidas[f'{fator}|soma'] = x
+        medidas[f'{fator}|soma2'] = x * x
+        medidas[f'{fator}|soma_churn'] = x * flag
+    base = pd.DataFrame(medidas, index=df.index)
+    base[DIMENSOES] = df[DIMENSOES]
+    return base.groupby(DIMENSOES, observed=True, dropna=False, sort=False).sum().reset_index()
+
+
+def montar_cubo_em_blocos(path: str, tamanho_bloco: int = TAMANHO_BLOCO) -> pd.DataFrame:
+    """O mesmo cubo de ``montar_cubo``, lendo o CSV em blocos (arquivos maiores que a memória).
+
+    As medidas são somas, então os cubos parciais de cada bloco se juntam com
+    outro groupby-sum; só um bloco de clientes fica na memória por vez.
+    """
+    parciais = []
+    blocos = pd.read_csv(path, usecols=COLUNAS, sep=',', encoding='latin1', dtype=DTYPES,
+                         chunksize=tamanho_bloco)
+    for bloco in blocos:
+        parciais.append(montar_cubo(derivar_colunas(bloco)))
+        # Junta de tempos em tempos para a lista de parciais não crescer com o arquivo
+        if len(parciais) >= 16:
+            parciais = [_juntar_cubos(parciais)]
+    cubo = _juntar_cubos(parciais)
+    # As categorias de cada bloco variam; no cubo final voltam a ser as do arquivo inteiro
+    for coluna in DIMENSOES:
+        if DTYPES.get(coluna) == 'category':
+            cubo[coluna] = cubo[coluna].astype('category')
+    return cubo
+
+
+def _juntar_cubos(parciais: list) -> pd.DataFrame:
+    return (pd.concat(parciais, ignore_index=True)
+            .groupby(DIMENSOES, observed=True, dropna=False, sort=False).sum().reset_index())
+
+
+def caminho_cubo(path: str):
+    destino = caminho_cache(path)
+    return destino.with_name(f"{destino.stem}.cubo.feather")
+
+
+# A definição do cubo entra na assinatura: mudar dimensões ou fatores invalida o arquivo
+_DEFINICAO = hashlib.sha1(repr((DIMENSOES, FATORES)).encode()).hexdigest()[:12]
+
+
+@st.cache_resource(show_spinner="Montando cubo de agregados...", max_entries=2)
+def _carregar_cubo(path: str, versao: str) -> pd.DataFrame:
+    destino = caminho_cubo(path)
+    assinatura = f"{versao}-{_DEFINICAO}"
+    cubo = ler_feather(destino, assinatura)
+    if cubo is None:
+        if usar_streaming(path):
+            cubo = montar_cubo_em_blocos(path)
+        else:
+            cubo = montar_cubo(_carregar_clientes(path, versao))
+        gravar_feather(cubo, destino, assinatura)
+    return cubo
+
+
+def carregar_cubo(path: str = ARQUIVO_CLIENTES) -> pd.DataFrame:
+    """Cubo de agregados dos clientes, montado uma vez por versão do arquivo e gravado em disco.
+
+    Com o cubo já gravado, os clientes nem chegam a ser lidos.
+    """
+    return _carregar_cubo(path, versao_arquivo(path))
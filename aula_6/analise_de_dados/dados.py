@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from comum.colunar import ler_tabela, versao_arquivo
+from comum.faixas import Faixas
+
+ARQUIVO_CLIENTES = 'aula_6/analise_de_dados/clientes.csv'
+
+salary_order = [
+    'Less than $40K',
+    '$40K - $60K',
+    '$60K - $80K',
+    '$80K - $120K',
+    '$120K +',
+    'Não informado'
+]
+
+labels = ['18–24','25–34','35–44','45–54','55–64','65+']
+# Faixas [18, 25), [25, 35), ..., [65, 100)
+faixas_idade = Faixas((18, 25, 35, 45, 55, 65, 100), tuple(labels), direita=False)
+
+# Tempo de casa em faixas anuais (os meses crus têm cardinalidade alta demais para o cubo)
+faixas_tempo = Faixas(
+    (0, 24, 36, 48, np.inf), ('Até 2 anos', '2–3 anos', '3–4 anos', '4 anos ou mais'), direita=False
+)
+
+salary_map = {
+    'Less than $40K': 30000,
+    '$40K - $60K':   50000,
+    '$60K - $80K':   70000,
+    '$80K - $120K': 100000,
+    '$120K +':      140000
+}
+
+# Tipos declarados na leitura: categóricas para as colunas de texto e
+# inteiros/floats de 32 bits para as numéricas
+DTYPES = {
+    'CLIENTNUM':                     'int64',
+    'Categoria':                     'category',
+    'Idade':                         'int32',
+    'Sexo':                          'category',
+    'Dependentes':                   'int32',
+    'Educação':                      'category',
+    'Estado Civil':                  'category',
+    'Faixa Salarial Anual':          pd.CategoricalDtype(salary_order, ordered=True),
+    'Categoria Cartão':              'category',
+    'Meses como Cliente':            'int32',
+    'Produtos Contratados':          'int32',
+    'Inatividade 12m':               'int32',
+    'Contatos 12m':                  'int32',
+    'Limite':                        'float32',
+    'Limite Consumido':              'int32',
+    'Limite Disponível':             'float32',
+    'Mudanças Transacoes_Q4_Q1':     'float32',
+    'Valor Transacoes 12m':          'int32',
+    'Qtde Transacoes 12m':           'int32',
+    'Mudança Qtde Transações_Q4_Q1': 'float32',
+    'Taxa de Utilização Cartão':     'float32',
+}
+
+
+# Colunas lidas pelo dashboard; as demais ficam só no arquivo colunar
+COLUNAS = [
+    'Categoria', 'Idade', 'Sexo', 'Educação', 'Estado Civil', 'Faixa Salarial Anual',
+    'Categoria Cartão', 'Meses como Cliente', 'Produtos Contratados', 'Inatividade 12m',
+    'Contatos 12m', 'Limite', 'Taxa de Utilização Cartão',
+]
+
+
+# cache_resource: o DataFrame é lido uma vez por versão do arquivo e compartilhado
+# sem cópia entre reruns e sessões; quem o recebe não deve modificá-lo.
+@st.cache_resource(show_spinner="Carregando clientes...", max_entries=2)
+def _carregar_clientes(path: str, versao: str) -> pd.DataFrame:
+    return derivar_colunas(ler_tabela(path, colunas=COLUNAS, sep=',', encoding='latin1', dtype=DTYPES))
+
+
+def derivar_colunas(df: pd.DataFrame) -> pd.DataFrame:
+    """Acrescenta as colunas derivadas (faixas de idade e de tempo, salário aproximado, churn) em ``df``."""
+    df['Faixa Etária'] = faixas_idade.classificar(df['Idade'])
+    df['Faixa de Tempo'] = faixas_tempo.classificar(df['Meses como Cliente'])
+    df['Salario_Aprox'] = df['Faixa Salarial Anual'].map(salary_map).astype('float32')
+    df['Razao_Limite_Salario'] = df['Limite'] / df['Salario_Aprox']
+    df['churn_flag'] = (df['Categoria'] == 'Cancelado').astype('int8')
+    return df
+
+
+def carregar_clientes(path: str = ARQUIVO_CLIENTES) -> pd.DataFrame:
+    """Clientes tipados e com as colunas derivadas, prontos para o dashboard."""
+    return _carregar_clientes(path, versao_arquivo(path))
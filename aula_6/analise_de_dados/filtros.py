@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+# Dimensões filtráveis na barra lateral: coluna -> rótulo
+FILTROS = {
+    'Categoria Cartão':     'Categoria do Cartão',
+    'Faixa Salarial Anual': 'Faixa Salarial',
+    'Faixa Etária':         'Faixa Etária',
+}
+COLUNA_TEMPO = 'Faixa de Tempo'
+
+
+class IndiceFiltros:
+    """Máscaras booleanas pré-calculadas para os filtros do dashboard.
+
+    Construído sobre as células do cubo (uma linha por combinação de dimensões).
+    Para cada dimensão de ``FILTROS`` guarda uma máscara por valor; aplicar um
+    filtro é só um OR entre as máscaras dos valores escolhidos e um AND entre
+    dimensões, sem refiltrar o DataFrame.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.n = len(df)
+        self.mascaras = {}
+        for coluna in FILTROS:
+            codigos = df[coluna].cat.codes.to_numpy()
+            self.mascaras[coluna] = {
+                valor: codigos == i for i, valor in enumerate(df[coluna].cat.categories)
+            }
+        # Faixas de tempo de casa presentes nos dados, em ordem; o filtro é um intervalo delas
+        codigos = df[COLUNA_TEMPO].cat.codes.to_numpy()
+        presentes = np.unique(codigos[codigos >= 0])
+        self.faixas_tempo = [df[COLUNA_TEMPO].cat.categories[c] for c in presentes]
+        self.tempo = codigos
+        self._codigo_tempo = dict(zip(self.faixas_tempo, presentes))
+
+    def valores(self, coluna: str) -> list:
+        # Só os valores que aparecem nos dados (categorias vazias não viram opção)
+        return [valor for valor, mascara in self.mascaras[coluna].items() if mascara.any()]
+
+    def mascara(self, selecao: dict, tempo: tuple) -> np.ndarray:
+        """Máscara combinada. ``selecao`` mapeia coluna -> valores escolhidos; vazio = sem filtro.
+
+        ``tempo`` é o intervalo (primeira, última) de ``faixas_tempo``.
+        """
+        resultado = np.ones(self.n, dtype=bool)
+        for coluna, escolhidos in selecao.items():
+            if not escolhidos or len(escolhidos) == len(self.valores(coluna)):
+                continue
+            por_valor = self.mascaras[coluna]
+            resultado &= np.logical_or.reduce([por_valor[valor] for valor in escolhidos])
+        if tempo != (self.faixas_tempo[0], self.faixas_tempo[-1]):
+            inicio, fim = self._codigo_tempo[tempo[0]], self._codigo_tempo[tempo[1]]
+            resultado &= (self.tempo >= inicio) & (self.tempo <= fim)
+        return resultado
+
+
+# Uma vez por versão do arquivo, compartilhado entre sessões
+@st.cache_resource(show_spinner=False, max_entries=2)
+def indice_filtros(_cubo: pd.DataFrame, versao: str) -> IndiceFiltros:
+    return IndiceFiltros(_cubo)
+
+
+def barra_lateral(indice: IndiceFiltros) -> tuple:
+    """Filtros na barra lateral. Retorna (máscara, assinatura hashável da seleção)."""
+    st.sidebar.header("🎛️ Filtros")
+    selecao = {
+        coluna: st.sidebar.multiselect(rotulo, indice.valores(coluna), placeholder="Todas")
+        for coluna, rotulo in FILTROS.items()
+    }
+    tempo = st.sidebar.select_slider(
+        "Tempo como Cliente", indice.faixas_tempo, (indice.faixas_tempo[0], indice.faixas_tempo[-1])
+    )
+    st.sidebar.caption("Sem seleção, a dimensão não é filtrada.")
+    assinatura = tuple((coluna, tuple(valores)) for coluna, valores in selecao.items()) + (tempo,)
+    return indice.mascara(selecao, tempo), assinatura
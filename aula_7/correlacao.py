@@ -0,0 +1,122 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+
+def _pearson_pareado(valores: np.ndarray, presente: np.ndarray = None) -> np.ndarray:
+    """Matriz de Pearson entre as colunas de ``valores``, com NaN tratado par a par.
+
+    Para cada par (i, j) só entram as linhas em que as duas colunas têm valor,
+    como no ``DataFrame.corr()``. Todas as somas por par saem de produtos de
+    matrizes, em uma passada só sobre os dados. ``presente`` (opcional) é a
+    matriz de valores presentes, se já conhecida.
+    """
+    if presente is None:
+        presente = ~np.isnan(valores)
+    # Centralizar pela média de cada coluna não muda a correlação e evita perda de precisão
+    centrado = np.where(presente, valores - np.nanmean(valores, axis=0), 0.0)
+    p = presente.astype(np.float64)
+
+    n = p.T @ p                        # linhas completas de cada par
+    sx = centrado.T @ p                # soma de x_i nas linhas em que x_j também existe
+    sxx = (centrado * centrado).T @ p  # idem para x_i²
+    sxy = centrado.T @ centrado        # soma de x_i·x_j (zeros onde falta um dos dois)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cov = sxy - sx * sx.T / n
+        var_i = sxx - sx * sx / n
+        r = cov / np.sqrt(var_i * var_i.T)
+    r[n < 2] = np.nan
+    return np.clip(r, -1.0, 1.0)
+
+
+def _postos(x: np.ndarray) -> np.ndarray:
+    """Postos de 1 a n, com a média dos postos nos empates (como ``rank()``)."""
+    _, inverso, contagem = np.unique(x, return_inverse=True, return_counts=True)
+    return (np.cumsum(contagem) - (contagem - 1) / 2)[inverso]
+
+
+def _spearman_pareado(valores: np.ndarray, presente: np.ndarray = None) -> np.ndarray:
+    """Matriz de Spearman com NaN tratado par a par, igual a ``DataFrame.corr('spearman')``.
+
+    Cada coluna é ranqueada uma vez e os postos passam pelo Pearson par a par.
+    Isso é exato para os pares em que as duas colunas têm valor nas mesmas
+    linhas; nos demais os postos mudam com as linhas descartadas, então esses
+    pares são agrupados pelo conjunto de linhas completas e, em cada grupo,
+    cada coluna é ranqueada uma vez e as correlações saem de um ``np.corrcoef``.
+    O custo é O(n log n) por coluna e por padrão distinto de linhas completas:
+    com faltantes em poucas colunas há poucos padrões; só no pior caso
+    (faltantes espalhados em todas) chega a O(k²·n log n).
+    """
+    if presente is None:
+        presente = ~np.isnan(valores)
+    postos = np.full_like(valores, np.nan)
+    for j in range(valores.shape[1]):
+        postos[presente[:, j], j] = _postos(valores[presente[:, j], j])
+    r = _pearson_pareado(postos, presente)
+
+    p = presente.astype(np.float64)
+    completas = p.T @ p
+    por_coluna = np.diag(completas)
+    refazer = (completas != por_coluna[:, None]) | (completas != por_coluna[None, :])
+    # Padrão de linhas completas (bitmap compactado) -> (linhas, pares com esse padrão)
+    grupos = {}
+    for i, j in zip(*np.nonzero(np.triu(refazer, k=1))):
+        linhas = presente[:, i] & presente[:, j]
+        grupos.setdefault(np.packbits(linhas).tobytes(), (linhas, []))[1].append((i, j))
+    for linhas, pares in grupos.values():
+        if linhas.sum() < 2:
+            continue  # já é NaN
+        colunas = sorted({c for par in pares for c in par})
+        posicao = {c: k for k, c in enumerate(colunas)}
+        postos_grupo = np.column_stack([_postos(valores[linhas, c]) for c in colunas])
+        with np.errstate(invalid='ignore', divide='ignore'):
+            matriz = np.corrcoef(postos_grupo, rowvar=False)
+        for i, j in pares:
+            r[i, j] = r[j, i] = matriz[posicao[i], posicao[j]]
+    return r
+
+
+class MatrizCorrelacao:
+    """Matrizes completas de Pearson e Spearman das colunas numéricas de um DataFrame.
+
+    Calculadas uma vez; as consultas (``submatriz``, ``coluna``) só recortam o
+    resultado. Ambas tratam NaN par a par, com os mesmos valores do
+    ``DataFrame.corr()``.
+    """
+
+    def __init__(self, df: pd.DataFrame, perfil=None):
+        numericas = df.select_dtypes(include=np.number)
+        self.colunas = list(numericas.columns)
+        # Com o perfil de faltantes, os valores presentes vêm dos bitmaps já montados
+        presente = perfil.validos(self.colunas) if perfil is not None else None
+        self.pearson = pd.DataFrame(
+            _pearson_pareado(numericas.to_numpy(dtype=np.float64), presente),
+            index=self.colunas, columns=self.colunas
+        )
+        self.spearman = pd.DataFrame(
+            _spearman_pareado(numericas.to_numpy(dtype=np.float64), presente),
+            index=self.colunas, columns=self.colunas
+        )
+
+    def _matriz(self, metodo: str) -> pd.DataFrame:
+        if metodo not in ('pearson', 'spearman'):
+            raise ValueError(f"Método de correlação desconhecido: {metodo}")
+        return self.pearson if metodo == 'pearson' else self.spearman
+
+    def submatriz(self, colunas: list, metodo: str = 'pearson') -> pd.DataFrame:
+        return self._matriz(metodo).loc[colunas, colunas]
+
+    def coluna(self, alvo: str, colunas: list = None, metodo: str = 'pearson') -> pd.Series:
+        """Correlação de ``colunas`` (padrão: todas) com ``alvo``."""
+        serie = self._matriz(metodo)[alvo]
+        return serie if colunas is None else serie.loc[colunas]
+
+    def par(self, a: str, b: str, metodo: str = 'pearson') -> float:
+        return float(self._matriz(metodo).at[a, b])
+
+
+# Uma vez por versão do arquivo, compartilhada entre sessões (somente leitura)
+@st.cache_resource(show_spinner="Calculando correlações...", max_entries=2)
+def matriz_correlacao(_df: pd.DataFrame, versao: str, _perfil=None) -> MatrizCorrelacao:
+    return MatrizCorrelacao(_df, _perfil)
@@ -0,0 +1,46 @@
+import pandas as pd
+import streamlit as st
+
+from comum.colunar import versao_arquivo
+from comum.esquemas import Coluna, Esquema, ler_com_esquema
+
+ARQUIVO = 'aula_7/Life_Expectancy_Data.csv'
+
+# Nomes canônicos (cabeçalho normalizado), tipos, unidades e faixas esperadas.
+# Floats de 32 bits onde a precisão basta; PIB e população ficam em 64 bits.
+ESQUEMA = Esquema('expectativa_de_vida', (
+    Coluna('Country',                         'category'),
+    Coluna('Year',                            'int16',    'ano',                 1900, 2100),
+    Coluna('Status',                          'category'),
+    Coluna('Life expectancy',                 'float32',  'anos',                0, 120),
+    Coluna('Adult Mortality',                 'float32',  'por 1000 adultos',    0, 1000),
+    Coluna('infant deaths',                   'int32',    'por 1000 hab.',       0, 1000),
+    Coluna('Alcohol',                         'float32',  'litros per capita',   0, 30),
+    Coluna('percentage expenditure',          'float32',  '% do PIB per capita', 0, None),
+    Coluna('Hepatitis B',                     'float32',  '% de cobertura',      0, 100),
+    Coluna('Measles',                         'int32',    'casos por 1000 hab.', 0, None),
+    Coluna('BMI',                             'float32',  'IMC médio',           10, 60),
+    Coluna('under-five deaths',               'int32',    'por 1000 hab.',       0, 1000),
+    Coluna('Polio',                           'float32',  '% de cobertura',      0, 100),
+    Coluna('Total expenditure',               'float32',  '% do gasto público',  0, 100),
+    Coluna('Diphtheria',                      'float32',  '% de cobertura',      0, 100),
+    Coluna('HIV/AIDS',                        'float32',  'mortes por 1000',     0, 1000),
+    Coluna('GDP',                             'float64',  'US$ per capita',      0, None),
+    Coluna('Population',                      'float64',  'habitantes',          0, None),
+    Coluna('thinness 1-19 years',             'float32',  '%',                   0, 100),
+    Coluna('thinness 5-9 years',              'float32',  '%',                   0, 100),
+    Coluna('Income composition of resources', 'float32',  'índice 0–1',          0, 1),
+    Coluna('Schooling',                       'float32',  'anos',                0, 30),
+))
+
+
+# cache_resource: lido uma vez por versão do arquivo e compartilhado entre a página
+# principal e a de países; quem o recebe não deve modificá-lo.
+@st.cache_resource(show_spinner="Carregando dados...", max_entries=2)
+def _carregar_dados(path: str, versao: str) -> pd.DataFrame:
+    return ler_com_esquema(path, ESQUEMA, sep=',', encoding='latin1')
+
+
+def carregar_dados(path: str = ARQUIVO) -> pd.DataFrame:
+    """Dados de expectativa de vida no ``ESQUEMA``: nomes canônicos e tipos declarados."""
+    return _carregar_dados(path, versao_arquivo(path))
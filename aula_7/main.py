@@ -1,22 +1,38 @@
+import sys
+from pathlib import Path
 import streamlit as st
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
-import numpy as np
+
+# Raiz do repositório no sys.path, para importar o pacote comum/
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from comum.colunar import versao_arquivo
+from comum.esquemas import ErroDeEsquema, fora_da_faixa
+from comum.graficos import mostrar_grafico
+from correlacao import matriz_correlacao
+from dados import ARQUIVO, ESQUEMA, carregar_dados
+from painel import painel_paises
+from perfil import perfil_faltantes
+from regressao import ajustar_regressoes, desenhar_regressao, regressoes
 
 # Para rodar: streamlit run aula_7/main.py
 
 st.set_page_config(page_title="Análise Estatística Expectativa de Vida", layout="wide")
 
-# 1) Carregar dados
-df = pd.read_csv('aula_7/Life_Expectancy_Data.csv', sep=',', encoding='latin1')
+# 1) Carregar dados (uma vez por versão do arquivo, já no esquema: nomes canônicos e tipos)
+try:
+    df = carregar_dados()
+except ErroDeEsquema as erro:
+    st.error(f"O arquivo de dados não corresponde ao esquema esperado.\n\n{erro}")
+    st.stop()
+# Versão do CSV: os gráficos são renderizados uma vez por versão
+versao = versao_arquivo(ARQUIVO)
 
-# 2) Limpeza de nomes de coluna: tira espaços nas bordas e colapsa múltiplos espaços em um
-df.columns = (
-    df.columns
-      .str.strip()
-      .str.replace(r"\s+", " ", regex=True)
-)
+# 2) Indicadores por país × ano (também usado pela página de países) e bitmaps
+# de valores presentes por coluna, que substituem isnull/dropna na página
+painel = painel_paises(df, versao)
+perfil = perfil_faltantes(df, versao)
 
 # 3) Definições de colunas-chave
 life_col    = "Life expectancy"
@@ -34,7 +50,7 @@ status_counts = df[['Country', status_col]].drop_duplicates()
 dev_counts    = status_counts.query("Status == 'Developing'")['Country'].nunique()
 ded_counts    = status_counts.query("Status == 'Developed'")['Country'].nunique()
 
-ctr_mean   = df.groupby('Country')[life_col].mean()
+ctr_mean   = painel.media_por_pais(life_col)
 best_ct    = ctr_mean.idxmax()
 best_val   = ctr_mean.max()
 worst_ct   = ctr_mean.idxmin()
@@ -61,7 +77,7 @@ sns.set_style("whitegrid")
 
 # 6) Avaliação de dados faltantes
 st.subheader("🕵️‍♂️ Dados Faltantes")
-missing = df.isnull().mean() * 100
+missing = perfil.percentual_faltante()
 missing_df = pd.DataFrame({
     "Coluna": missing.index,
     "Percentual (%)": missing.values
@@ -71,70 +87,119 @@ m1, m2 = st.columns((1, 2))
 with m1:
     st.dataframe(missing_df, height=250)
 with m2:
-    fig, ax = plt.subplots(figsize=(8, 3))
-    sns.barplot(data=missing_df, x="Percentual (%)", y="Coluna", ax=ax)
-    ax.set_xlabel("% de valores faltantes")
-    st.pyplot(fig)
+    def grafico_faltantes():
+        fig, ax = plt.subplots(figsize=(8, 3))
+        sns.barplot(data=missing_df, x="Percentual (%)", y="Coluna", ax=ax)
+        ax.set_xlabel("% de valores faltantes")
+        return fig
+
+    mostrar_grafico(grafico_faltantes, versao, 'faltantes')
+
+# Valores fora da faixa declarada no esquema (ex.: IMC médio acima de 60)
+fora = fora_da_faixa(df, ESQUEMA)
+if len(fora):
+    with st.expander(f"⚠️ Valores fora da faixa esperada em {len(fora)} coluna(s)"):
+        st.dataframe(fora, hide_index=True)
 
 st.divider()
 
 # 7) Análises detalhadas em abas
 st.subheader("📊 Análises Detalhadas")
-tabs = st.tabs([
-    "🔗 Correlação com Expectativa",
-    "💊 Gasto em Saúde (<65 anos)",
-    "⚖️ Mortalidade Infantil x Adulta",
-    "🍏 Hábitos de Vida",
-    "🎓 Educação e Renda",
-    "💉 Cobertura de Imunização"
-])
+
+# Cada aba e cada questão é uma função: só a seção aberta é calculada e desenhada
+# a cada execução. Os cálculos ficam em cache por versão do CSV e os gráficos no
+# cache de imagens, então reabrir uma seção não refaz nada.
+
+
+# Pearson e Spearman de todas as colunas numéricas, calculados uma vez por versão;
+# cada análise só recorta a coluna ou submatriz de que precisa
+correlacoes = matriz_correlacao(df, versao, perfil)
+
+
+def correlacao_com_vida(colunas: list = None) -> pd.Series:
+    """Correlação de ``colunas`` (padrão: todas as numéricas) com a expectativa de vida, em ordem crescente."""
+    return correlacoes.coluna(life_col, colunas + [life_col] if colunas else None).sort_values()
+
+
+lifestyle = ["Alcohol", "BMI", "thinness 1-19 years", "thinness 5-9 years"]
+socio = ["Schooling", "Income composition of resources"]
+immun = ["Hepatitis B", "Polio", "Diphtheria", "Measles"]
+
+# Retas de regressão (com faixa de confiança analítica) de todas as colunas
+# usadas nos gráficos contra a expectativa de vida, em uma passada e em cache
+ajustes = regressoes(df, tuple(lifestyle + socio + ["Hepatitis B"]), life_col, versao, perfil)
+
+
+# Usado na aba 3 e na questão 3: a segunda exibição vem do cache
+def grafico_mortalidade():
+    fig4, ax4 = plt.subplots(figsize=(6, 4))
+    sc = ax4.scatter(
+        df["Adult Mortality"],
+        df["infant deaths"],
+        c=df[life_col],
+        cmap="viridis",
+        alpha=0.7
+    )
+    ax4.set_xlabel("Mortalidade Adulta")
+    ax4.set_ylabel("Mortalidade Infantil")
+    cbar = plt.colorbar(sc, ax=ax4)
+    cbar.set_label("Expectativa de Vida")
+    return fig4
+
+
+# Usado na aba 4 e na questão 4
+def grafico_habitos():
+    corr_life = correlacao_com_vida(lifestyle)
+    fig5, ax5 = plt.subplots(figsize=(6, 4))
+    sns.barplot(x=corr_life.values, y=corr_life.index,
+                palette="coolwarm_r", ax=ax5)
+    ax5.set_xlabel("Coeficiente de correlação")
+    return fig5
+
 
 # Aba 1: Correlações
-with tabs[0]:
+def aba_correlacao():
     st.markdown("**Top 5 Correlações Positivas e Negativas**")
-    num_df = df.select_dtypes(include=np.number)
-    corr = num_df.corr()[life_col].sort_values()
+    corr = correlacao_com_vida()
     top_corr = pd.concat([corr.head(5), corr.tail(5)])
-    fig2, ax2 = plt.subplots(figsize=(6, 4))
-    sns.barplot(x=top_corr.values, y=top_corr.index, palette="vlag", ax=ax2)
-    ax2.set_xlabel("Coeficiente de correlação")
-    st.pyplot(fig2)
+
+    def grafico_top_corr():
+        fig2, ax2 = plt.subplots(figsize=(6, 4))
+        sns.barplot(x=top_corr.values, y=top_corr.index, palette="vlag", ax=ax2)
+        ax2.set_xlabel("Coeficiente de correlação")
+        return fig2
+
+    mostrar_grafico(grafico_top_corr, versao, 'top_corr')
     st.markdown("""
     **O que este gráfico mostra:**  
     - Variáveis à direita (positivas) associadas a maior expectativa;  
     - Variáveis à esquerda (negativas) associadas a menor expectativa.
     """)
 
+
 # Aba 2: Gasto em Saúde em países com expectativa < 65
-with tabs[1]:
+def aba_gasto_saude():
     st.markdown("**Distribuição de Gasto em Saúde (%) — Expectativa < 65 anos**")
     low_life = df[df[life_col] < 65]
-    fig3, ax3 = plt.subplots(figsize=(6, 4))
-    sns.boxplot(data=low_life, x=health_col, ax=ax3)
-    ax3.set_xlabel("Gasto em Saúde (%)")
-    st.pyplot(fig3)
+
+    def grafico_gasto_baixa():
+        fig3, ax3 = plt.subplots(figsize=(6, 4))
+        sns.boxplot(data=low_life, x=health_col, ax=ax3)
+        ax3.set_xlabel("Gasto em Saúde (%)")
+        return fig3
+
+    mostrar_grafico(grafico_gasto_baixa, versao, 'gasto_baixa')
     st.markdown("""
     **O que este gráfico mostra:**  
     - Mediana e quartis dos gastos em saúde nos países com vida < 65 anos;  
     - Outliers indicam casos extremos de investimento.
     """)
 
+
 # Aba 3: Mortalidade Infantil x Mortalidade Adulta
-with tabs[2]:
+def aba_mortalidade():
     st.markdown("**Relação entre Mortalidade Adulta e Infantil**")
-    fig4, ax4 = plt.subplots(figsize=(6, 4))
-    sc = ax4.scatter(
-        df["Adult Mortality"],
-        df["infant deaths"],
-        c=df[life_col],
-        cmap="viridis",
-        alpha=0.7
-    )
-    ax4.set_xlabel("Mortalidade Adulta")
-    ax4.set_ylabel("Mortalidade Infantil")
-    cbar = plt.colorbar(sc, ax=ax4)
-    cbar.set_label("Expectativa de Vida")
-    st.pyplot(fig4)
+    mostrar_grafico(grafico_mortalidade, versao, 'mortalidade')
     st.markdown("""
     **O que este gráfico mostra:**  
     - Cada ponto é um país/ano;  
@@ -142,19 +207,13 @@ with tabs[2]:
     - Países com altas mortalidades apresentam baixas expectativas.
     """)
 
+
 # Aba 4: Hábitos de Vida
-with tabs[3]:
+def aba_habitos():
     st.markdown("**🍏 Hábitos de Vida vs Expectativa de Vida**")
 
     # 1) Gráfico de correlações
-    lifestyle = ["Alcohol", "BMI", "thinness 1-19 years", "thinness 5-9 years"]
-    corr_life = df[lifestyle + [life_col]].corr()[life_col].sort_values()
-
-    fig5, ax5 = plt.subplots(figsize=(6, 4))
-    sns.barplot(x=corr_life.values, y=corr_life.index,
-                palette="coolwarm_r", ax=ax5)
-    ax5.set_xlabel("Coeficiente de correlação")
-    st.pyplot(fig5)
+    mostrar_grafico(grafico_habitos, versao, 'habitos')
 
     st.markdown("""
     **Interpretação:**  
@@ -167,25 +226,25 @@ with tabs[3]:
     for col_name, col_holder in zip(lifestyle, cols):
         with col_holder:
             st.subheader(col_name)
-            fig, ax = plt.subplots(figsize=(4, 4))
-            sns.regplot(
-                data=df,
-                x=col_name,
-                y=life_col,
-                scatter_kws={"alpha": 0.3},
-                line_kws={"linewidth": 1},
-                ax=ax
-            )
-            ax.set_xlabel(col_name)
-            ax.set_ylabel("Expectativa de Vida")
-            st.pyplot(fig)
-            plt.close(fig)
+
+            def grafico_regressao_habito():
+                fig, ax = plt.subplots(figsize=(4, 4))
+                desenhar_regressao(
+                    ax, df, col_name, life_col, ajustes.loc[col_name],
+                    scatter_kws={"alpha": 0.3},
+                    line_kws={"linewidth": 1}
+                )
+                ax.set_xlabel(col_name)
+                ax.set_ylabel("Expectativa de Vida")
+                return fig
+
+            mostrar_grafico(grafico_regressao_habito, versao, 'regressao_habito', col_name)
+
 
 # Aba 5: Educação e Renda
-with tabs[4]:
+def aba_educacao():
     st.markdown("**🎓 Escolaridade e Composição de Renda vs Expectativa de Vida**")
-    socio = ["Schooling", "Income composition of resources"]
-    corr_socio = df[socio + [life_col]].corr()[life_col].sort_values()
+    corr_socio = correlacao_com_vida(socio)
     st.table(corr_socio.rename("Coeficiente de correlação"))
 
     # Dispor cada gráfico em sua própria coluna
@@ -193,124 +252,168 @@ with tabs[4]:
     for col_name, col_holder in zip(socio, cols):
         with col_holder:
             st.subheader(col_name)
-            fig, ax = plt.subplots(figsize=(4, 4))
-            sns.regplot(
-                data=df,
-                x=col_name,
-                y=life_col,
-                scatter_kws={"alpha": 0.3},
-                line_kws={"color": "red"},
-                ax=ax
-            )
-            ax.set_xlabel(col_name)
-            ax.set_ylabel("Expectativa de Vida")
-            st.pyplot(fig)
-            plt.close(fig)
+
+            def grafico_regressao_socio():
+                fig, ax = plt.subplots(figsize=(4, 4))
+                desenhar_regressao(
+                    ax, df, col_name, life_col, ajustes.loc[col_name],
+                    scatter_kws={"alpha": 0.3},
+                    line_kws={"color": "red"}
+                )
+                ax.set_xlabel(col_name)
+                ax.set_ylabel("Expectativa de Vida")
+                return fig
+
+            mostrar_grafico(grafico_regressao_socio, versao, 'regressao_socio', col_name)
 
     st.markdown("""
     **O que vemos:**  
     - Mais anos de estudo e melhor composição de recursos financeiros associam-se a maior expectativa de vida.
     """)
+
+
 # Aba 6: Cobertura de Imunização
-with tabs[5]:
+def aba_imunizacao():
     st.markdown("**💉 Cobertura de Vacinas vs Expectativa de Vida**")
-    immun = ["Hepatitis B", "Polio", "Diphtheria", "Measles"]
-    corr_immun = df[immun + [life_col]].corr()[life_col].sort_values()
-    fig6, ax6 = plt.subplots(figsize=(6, 4))
-    sns.barplot(x=corr_immun.values, y=corr_immun.index, palette="vlag_r", ax=ax6)
-    ax6.set_xlabel("Coeficiente de correlação")
-    st.pyplot(fig6)
+    corr_immun = correlacao_com_vida(immun)
+
+    def grafico_vacinas():
+        fig6, ax6 = plt.subplots(figsize=(6, 4))
+        sns.barplot(x=corr_immun.values, y=corr_immun.index, palette="vlag_r", ax=ax6)
+        ax6.set_xlabel("Coeficiente de correlação")
+        return fig6
+
+    mostrar_grafico(grafico_vacinas, versao, 'vacinas')
     st.markdown("""
     **Insights:**  
     - Coberturas mais altas de vacinas tendem a elevar a expectativa de vida.
     """)
-    fig7, ax7 = plt.subplots(figsize=(5, 3))
-    sns.scatterplot(data=df, x="Hepatitis B", y=life_col, alpha=0.4, ax=ax7)
-    sns.regplot(data=df, x="Hepatitis B", y=life_col, scatter=False, ax=ax7)
-    ax7.set_title("Hepatitis B vs Expectativa de Vida")
-    st.pyplot(fig7)
+
+    def grafico_hepatite():
+        fig7, ax7 = plt.subplots(figsize=(5, 3))
+        sns.scatterplot(data=df, x="Hepatitis B", y=life_col, alpha=0.4, ax=ax7)
+        desenhar_regressao(ax7, df, "Hepatitis B", life_col, ajustes.loc["Hepatitis B"], scatter=False)
+        ax7.set_title("Hepatitis B vs Expectativa de Vida")
+        return fig7
+
+    mostrar_grafico(grafico_hepatite, versao, 'hepatite')
+
+
+# Navegação guardada no session_state: a aba escolhida é a única executada
+ABAS = {
+    "🔗 Correlação com Expectativa": aba_correlacao,
+    "💊 Gasto em Saúde (<65 anos)": aba_gasto_saude,
+    "⚖️ Mortalidade Infantil x Adulta": aba_mortalidade,
+    "🍏 Hábitos de Vida": aba_habitos,
+    "🎓 Educação e Renda": aba_educacao,
+    "💉 Cobertura de Imunização": aba_imunizacao,
+}
+aba = st.radio("Análise", list(ABAS), horizontal=True, key="aula7_aba", label_visibility="collapsed")
+ABAS[aba]()
 
 st.divider()
 st.header("📑 Respostas às Questões")
 
+
 # 1.
-with st.expander("1. Os vários fatores de previsão inicialmente escolhidos realmente afetam a expectativa de vida?"):
+def questao_1():
     st.markdown("**Análise via correlações**")
-    num_df = df.select_dtypes(include=np.number)
-    corr_all = num_df.corr()[life_col].sort_values()
+    corr_all = correlacao_com_vida()
     top5 = pd.concat([corr_all.head(5), corr_all.tail(5)])
-    fig_q1, ax_q1 = plt.subplots(figsize=(6, 4))
-    sns.barplot(x=top5.values, y=top5.index, palette="vlag_r", ax=ax_q1)
-    ax_q1.set_xlabel("Coeficiente de Correlação")
-    st.pyplot(fig_q1)
+
+    def grafico_q1():
+        fig_q1, ax_q1 = plt.subplots(figsize=(6, 4))
+        sns.barplot(x=top5.values, y=top5.index, palette="vlag_r", ax=ax_q1)
+        ax_q1.set_xlabel("Coeficiente de Correlação")
+        return fig_q1
+
+    mostrar_grafico(grafico_q1, versao, 'q1')
     st.markdown(f"""
     - **Top 3 positivas**: {', '.join(top5.tail(3).index)}  
     - **Top 3 negativas**: {', '.join(top5.head(3).index)}  
     """)
+
+
 # 2.
-with st.expander("2. Um país com menor expectativa de vida (<65) deve aumentar seus gastos com saúde para melhorar sua expectativa de vida média?"):
+def questao_2():
     st.markdown("**Relação Gasto em Saúde x Expectativa (<65 anos)**")
-    low = df[df[life_col] < 65].dropna(subset=[health_col, life_col])
-    fig_q2, ax_q2 = plt.subplots(figsize=(6, 4))
-    sns.regplot(data=low, x=health_col, y=life_col,
-                scatter_kws={"alpha": 0.5}, line_kws={"color": "red"}, ax=ax_q2)
-    ax_q2.set_xlabel("Gasto em Saúde (%)")
-    ax_q2.set_ylabel("Expectativa de Vida")
-    ax_q2.set_title("Gasto em Saúde vs Expectativa (<65 anos)")
-    st.pyplot(fig_q2)
+    low = df[(df[life_col] < 65) & perfil.mascara_completa([health_col, life_col])]
+
+    def grafico_q2():
+        fig_q2, ax_q2 = plt.subplots(figsize=(6, 4))
+        ajuste = ajustar_regressoes(low, [health_col], life_col).loc[health_col]
+        desenhar_regressao(ax_q2, low, health_col, life_col, ajuste,
+                           scatter_kws={"alpha": 0.5}, line_kws={"color": "red"})
+        ax_q2.set_xlabel("Gasto em Saúde (%)")
+        ax_q2.set_ylabel("Expectativa de Vida")
+        ax_q2.set_title("Gasto em Saúde vs Expectativa (<65 anos)")
+        return fig_q2
+
+    mostrar_grafico(grafico_q2, versao, 'q2')
     corr_low = low[[health_col, life_col]].corr().iloc[0,1]
     st.markdown(f"**Correlação:** {corr_low:.2f} → {'positiva' if corr_low>0 else 'negativa'}, sugerindo que aumentar investimento em saúde tende a elevar a expectativa.")
 
+
 # 3.
-with st.expander("3. Como as taxas de mortalidade infantil e adulta afetam a expectativa de vida?"):
+def questao_3():
     st.markdown("**Scatter Adult Mortality x Infant Deaths (colorido por expectativa)**")
-    st.pyplot(fig4)
+    mostrar_grafico(grafico_mortalidade, versao, 'mortalidade')
     st.markdown("Vê-se que pontos com altas taxas em ambas as mortalidades estão associados às cores mais escuras (baixa expectativa).")
-    mort_corr = df[["Adult Mortality","infant deaths", life_col]].corr()[life_col]
+    mort_corr = correlacoes.coluna(life_col, ["Adult Mortality", "infant deaths", life_col])
     st.table(mort_corr.rename("Coef. de correlação"))
 
+
 # 4.
-with st.expander("4. A expectativa de vida tem correlação positiva ou negativa com hábitos alimentares, estilo de vida, exercícios, fumo, consumo de álcool etc.?"):
+def questao_4():
     st.markdown("**Correlação com hábitos de vida**")
-    st.pyplot(fig5)
+    mostrar_grafico(grafico_habitos, versao, 'habitos')
     st.markdown("""
     - **Positivo**: BMI  
     - **Negativo**: thinness 1-19 years, thinness 5-9 years  
     - **Alcohol** aparece levemente `{corr:.2f}`  
-    """.replace("{corr:.2f}", f"{corr_life['Alcohol']:.2f}"))
+    """.replace("{corr:.2f}", f"{correlacao_com_vida(lifestyle)['Alcohol']:.2f}"))
 
     # mostrar os 4 scatter/regressões lado a lado
     cols = st.columns(4)
     for nome, cont in zip(lifestyle, cols):
         with cont:
             st.subheader(nome)
-            fig, ax = plt.subplots(figsize=(4,4))
-            sns.regplot(data=df, x=nome, y=life_col,
-                        scatter_kws={"alpha":0.3}, line_kws={"linewidth":1}, ax=ax)
-            st.pyplot(fig)
-            plt.close(fig)
+
+            def grafico_q4():
+                fig, ax = plt.subplots(figsize=(4,4))
+                desenhar_regressao(ax, df, nome, life_col, ajustes.loc[nome],
+                                   scatter_kws={"alpha":0.3}, line_kws={"linewidth":1})
+                return fig
+
+            mostrar_grafico(grafico_q4, versao, 'q4', nome)
+
 
 # 5.
-with st.expander("5. Qual é o impacto da escolaridade na expectativa de vida dos seres humanos?"):
+def questao_5():
     st.markdown("**Regressão: Anos de Escolaridade x Expectativa**")
-    fig_q5, ax_q5 = plt.subplots(figsize=(6,4))
-    sns.regplot(data=df, x="Schooling", y=life_col,
-                scatter_kws={"alpha":0.3}, line_kws={"color":"blue"}, ax=ax_q5)
-    ax_q5.set_xlabel("Anos de Escolaridade")
-    ax_q5.set_ylabel("Expectativa de Vida")
-    st.pyplot(fig_q5)
-    corr_sch = df[["Schooling", life_col]].corr().iloc[0,1]
+
+    def grafico_q5():
+        fig_q5, ax_q5 = plt.subplots(figsize=(6,4))
+        desenhar_regressao(ax_q5, df, "Schooling", life_col, ajustes.loc["Schooling"],
+                           scatter_kws={"alpha":0.3}, line_kws={"color":"blue"})
+        ax_q5.set_xlabel("Anos de Escolaridade")
+        ax_q5.set_ylabel("Expectativa de Vida")
+        return fig_q5
+
+    mostrar_grafico(grafico_q5, versao, 'q5')
+    corr_sch = correlacoes.par("Schooling", life_col)
     st.markdown(f"**Correlação:** {corr_sch:.2f} → escolaridade elevada está associada a maior longevidade.")
 
-with st.expander("6. A expectativa de vida tem relação positiva ou negativa com o consumo de álcool?"):
+
+def questao_6():
     st.markdown("**Análise de correlação — global e por Status**")
 
     # 1) Correlação global
-    corr_global = df[["Alcohol", life_col]].dropna().corr().iloc[0,1]
+    corr_global = correlacoes.par("Alcohol", life_col)
     st.markdown(f"- **Correlação global:** {corr_global:.2f} → {'positiva' if corr_global>0 else 'negativa'}")
 
     # 2) Correlação por grupo
-    df_group = df[["Status","Alcohol",life_col]].dropna()
+    df_group = df.loc[perfil.mascara_completa(["Status", "Alcohol", life_col]), ["Status", "Alcohol", life_col]]
     group_corr = (
         df_group
         .groupby("Status")
@@ -321,28 +424,30 @@ with st.expander("6. A expectativa de vida tem relação positiva ou negativa co
     st.table(group_corr)
 
     # 3) Plot multigrupo
-    fig, ax = plt.subplots(figsize=(6,4))
-    sns.scatterplot(
-        data=df_group,
-        x="Alcohol",
-        y=life_col,
-        hue="Status",
-        alpha=0.6,
-        ax=ax
-    )
-    for status, color in zip(["Developed","Developing"], ["blue","orange"]):
-        sns.regplot(
-            data=df_group.query("Status == @status"),
+    def grafico_q6():
+        fig, ax = plt.subplots(figsize=(6,4))
+        sns.scatterplot(
+            data=df_group,
             x="Alcohol",
             y=life_col,
-            scatter=False,
-            label=status,
+            hue="Status",
+            alpha=0.6,
             ax=ax
         )
-    ax.set_xlabel("Consumo de Álcool (litros/ano)")
-    ax.set_ylabel("Expectativa de Vida")
-    ax.legend(title="Status")
-    st.pyplot(fig)
+        for status, color in zip(["Developed","Developing"], ["blue","orange"]):
+            grupo = df_group.query("Status == @status")
+            desenhar_regressao(
+                ax, grupo, "Alcohol", life_col,
+                ajustar_regressoes(grupo, ["Alcohol"], life_col).loc["Alcohol"],
+                scatter=False,
+                label=status
+            )
+        ax.set_xlabel("Consumo de Álcool (litros/ano)")
+        ax.set_ylabel("Expectativa de Vida")
+        ax.legend(title="Status")
+        return fig
+
+    mostrar_grafico(grafico_q6, versao, 'q6')
 
     # 4) Insight final
     corr_dev = group_corr.loc["Developed", "Correlação"]
@@ -356,22 +461,26 @@ with st.expander("6. A expectativa de vida tem relação positiva ou negativa co
     - **Conclusão:** a associação global positiva é um artefato de viés socioeconômico e não implica que “beber mais aumenta a longevidade”.
     """)
 
+
 # 7.
-with st.expander("7. Países densamente povoados tendem a ter menor expectativa de vida?"):
+def questao_7():
     st.markdown("**População (proxy) vs Expectativa — análise estatística**")
     
     # 1) Gráficos originais
-    fig_q7, ax_q7 = plt.subplots(figsize=(6,4))
-    sns.scatterplot(data=df, x="Population", y=life_col, alpha=0.3, ax=ax_q7)
-    ax_q7.set_xscale("log")
-    ax_q7.set_xlabel("População (escala log)")
-    ax_q7.set_ylabel("Expectativa de Vida")
-    st.pyplot(fig_q7)
+    def grafico_q7():
+        fig_q7, ax_q7 = plt.subplots(figsize=(6,4))
+        sns.scatterplot(data=df, x="Population", y=life_col, alpha=0.3, ax=ax_q7)
+        ax_q7.set_xscale("log")
+        ax_q7.set_xlabel("População (escala log)")
+        ax_q7.set_ylabel("Expectativa de Vida")
+        return fig_q7
+
+    mostrar_grafico(grafico_q7, versao, 'q7')
     
     # 2) Correlações
-    sub = df[[ "Population", life_col ]].dropna()
-    pearson = sub.corr().iloc[0,1]
-    spearman = sub.corr(method="spearman").iloc[0,1]
+    sub = df.loc[perfil.mascara_completa(["Population", life_col]), ["Population", life_col]]
+    pearson = correlacoes.par("Population", life_col)
+    spearman = correlacoes.par("Population", life_col, metodo="spearman")
     st.markdown(
         f"- **Coeficiente de correlação de Pearson (r):** {pearson:.2f}  \n"
         f"- **Coeficiente de correlação de Spearman (ρ):** {spearman:.2f}"
@@ -391,12 +500,16 @@ with st.expander("7. Países densamente povoados tendem a ter menor expectativa
         "Q1 (menor)", "Q2", "Q3", "Q4 (maior)"
     ])
     mean_by_q = df_q.groupby("pop_quartil")[life_col].mean().reset_index()
-    fig_q7b, ax_q7b = plt.subplots(figsize=(6,3))
-    sns.barplot(data=mean_by_q, x="pop_quartil", y=life_col, ax=ax_q7b)
-    ax_q7b.set_xlabel("Quartil de População")
-    ax_q7b.set_ylabel("Média da Expectativa de Vida")
-    plt.xticks(rotation=15)
-    st.pyplot(fig_q7b)
+
+    def grafico_q7_quartis():
+        fig_q7b, ax_q7b = plt.subplots(figsize=(6,3))
+        sns.barplot(data=mean_by_q, x="pop_quartil", y=life_col, ax=ax_q7b)
+        ax_q7b.set_xlabel("Quartil de População")
+        ax_q7b.set_ylabel("Média da Expectativa de Vida")
+        plt.xticks(rotation=15)
+        return fig_q7b
+
+    mostrar_grafico(grafico_q7_quartis, versao, 'q7_quartis')
     
     # 4) Insight
     st.markdown("""
@@ -406,11 +519,11 @@ with st.expander("7. Países densamente povoados tendem a ter menor expectativa
     - Conclusão: não há evidência de que países mais populosos vivam menos.
     """)
 
+
 # 8.
-with st.expander("8. Qual é o impacto da cobertura de imunização na expectativa de vida?"):
+def questao_8():
     # 1) Tabela de correlações
-    immun = ["Hepatitis B", "Polio", "Diphtheria", "Measles"]
-    corr_immun = df[immun + [life_col]].corr()[life_col].sort_values()
+    corr_immun = correlacao_com_vida(immun)
     df_corr_immun = corr_immun.rename("Coef. de correlação").to_frame()
     st.markdown("**1) Valores de correlação entre cobertura de vacinas e expectativa de vida**")
     st.table(df_corr_immun)
@@ -425,32 +538,37 @@ with st.expander("8. Qual é o impacto da cobertura de imunização na expectati
 
     # 3) Gráfico das correlações
     st.markdown("**2) Gráfico comparativo de todas as vacinas**")
-    fig_q8, ax_q8 = plt.subplots(figsize=(6,4))
-    sns.barplot(
-        x=corr_immun.values,
-        y=corr_immun.index,
-        palette="vlag_r",
-        ax=ax_q8
-    )
-    ax_q8.set_xlabel("Coeficiente de correlação")
-    ax_q8.set_title("Cobertura de vacinas vs Expectativa de vida")
-    st.pyplot(fig_q8)
+
+    def grafico_q8():
+        fig_q8, ax_q8 = plt.subplots(figsize=(6,4))
+        sns.barplot(
+            x=corr_immun.values,
+            y=corr_immun.index,
+            palette="vlag_r",
+            ax=ax_q8
+        )
+        ax_q8.set_xlabel("Coeficiente de correlação")
+        ax_q8.set_title("Cobertura de vacinas vs Expectativa de vida")
+        return fig_q8
+
+    mostrar_grafico(grafico_q8, versao, 'q8')
 
     # 4) Exemplo detalhado – Hepatitis B
     st.markdown("**3) Exemplo de regressão: cobertura de Hepatitis B**")
-    fig_hb, ax_hb = plt.subplots(figsize=(5,3))
-    sns.regplot(
-        data=df,
-        x="Hepatitis B",
-        y=life_col,
-        scatter_kws={"alpha":0.4},
-        line_kws={"color":"purple"},
-        ax=ax_hb
-    )
-    ax_hb.set_xlabel("Cobertura Hepatitis B (%)")
-    ax_hb.set_ylabel("Expectativa de Vida")
-    ax_hb.set_title("Hepatitis B vs Expectativa de Vida")
-    st.pyplot(fig_hb)
+
+    def grafico_q8_hepatite():
+        fig_hb, ax_hb = plt.subplots(figsize=(5,3))
+        desenhar_regressao(
+            ax_hb, df, "Hepatitis B", life_col, ajustes.loc["Hepatitis B"],
+            scatter_kws={"alpha":0.4},
+            line_kws={"color":"purple"}
+        )
+        ax_hb.set_xlabel("Cobertura Hepatitis B (%)")
+        ax_hb.set_ylabel("Expectativa de Vida")
+        ax_hb.set_title("Hepatitis B vs Expectativa de Vida")
+        return fig_hb
+
+    mostrar_grafico(grafico_q8_hepatite, versao, 'q8_hepatite')
 
     # 5) Insight interpretativo
     st.markdown("""
@@ -459,6 +577,33 @@ with st.expander("8. Qual é o impacto da cobertura de imunização na expectati
 - Polio e Diphtheria têm os coeficientes mais altos (~0.6), refletindo o peso desses programas nos primeiros anos de vida.  
 - Coberturas elevadas de Hepatitis B e Measles também ajudam a reduzir infecções graves que impactam a expectativa média, especialmente em populações vulneráveis.
     """)
+
+
+# Enunciado exibido -> função que responde
+QUESTOES = {
+    "1. Os vários fatores de previsão inicialmente escolhidos realmente afetam a expectativa de vida?":
+        questao_1,
+    "2. Um país com menor expectativa de vida (<65) deve aumentar seus gastos com saúde para melhorar sua expectativa de vida média?":
+        questao_2,
+    "3. Como as taxas de mortalidade infantil e adulta afetam a expectativa de vida?":
+        questao_3,
+    "4. A expectativa de vida tem correlação positiva ou negativa com hábitos alimentares, estilo de vida, exercícios, fumo, consumo de álcool etc.?":
+        questao_4,
+    "5. Qual é o impacto da escolaridade na expectativa de vida dos seres humanos?":
+        questao_5,
+    "6. A expectativa de vida tem relação positiva ou negativa com o consumo de álcool?":
+        questao_6,
+    "7. Países densamente povoados tendem a ter menor expectativa de vida?":
+        questao_7,
+    "8. Qual é o impacto da cobertura de imunização na expectativa de vida?":
+        questao_8,
+}
+# Cada questão é uma chave (toggle): o conteúdo só é calculado quando está ligada
+for enunciado, questao in QUESTOES.items():
+    if st.toggle(enunciado, key=f"aula7_{questao.__name__}"):
+        with st.container(border=True):
+            questao()
+
 st.divider()
 st.header("📌 Conclusões Finais")
 
@@ -0,0 +1,60 @@
+import sys
+from pathlib import Path
+import streamlit as st
+import pandas as pd
+
+# Raiz do repositório no sys.path, para importar o pacote comum/
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from comum.colunar import versao_arquivo
+from dados import ARQUIVO, carregar_dados
+from painel import painel_paises
+
+st.set_page_config(page_title="Expectativa de Vida por País", layout="wide")
+
+df = carregar_dados()
+painel = painel_paises(df, versao_arquivo(ARQUIVO))
+
+st.title("🗺️ Expectativa de Vida por País")
+st.markdown("Trajetória de um indicador ao longo dos anos, com variação anual e média móvel.")
+st.divider()
+
+c1, c2, c3 = st.columns([3, 2, 1])
+paises = c1.multiselect(
+    "Países", list(painel.paises),
+    default=[p for p in ["Brazil", "Argentina"] if p in painel],
+    max_selections=8
+)
+indicadores = painel.indicadores
+indicador = c2.selectbox("Indicador", indicadores, index=indicadores.index("Life expectancy"))
+janela = c3.slider("Média móvel (anos)", 1, 10, 3)
+
+if not paises:
+    st.info("Selecione ao menos um país.")
+    st.stop()
+
+# Resumo: último valor disponível e variação para o ano anterior
+cols = st.columns(min(len(paises), 4))
+for i, pais in enumerate(paises):
+    serie = painel.trajetoria(pais, [indicador])[indicador].dropna()
+    delta = painel.variacao_anual(pais, indicador).dropna()
+    cols[i % len(cols)].metric(
+        f"{pais} ({int(serie.index[-1])})" if len(serie) else pais,
+        f"{serie.iloc[-1]:,.2f}" if len(serie) else "–",
+        f"{delta.iloc[-1]:+,.2f}" if len(delta) else None,
+    )
+
+st.subheader(f"📈 {indicador} por ano")
+st.line_chart(painel.comparar(paises, indicador))
+
+t1, t2 = st.columns(2)
+with t1:
+    st.subheader("Variação anual")
+    st.bar_chart(pd.DataFrame({p: painel.variacao_anual(p, indicador) for p in paises}), stack=False)
+with t2:
+    st.subheader(f"Média móvel de {janela} anos")
+    st.line_chart(pd.DataFrame({p: painel.media_movel(p, indicador, janela) for p in paises}))
+
+with st.expander("📋 Todos os indicadores por ano"):
+    pais = st.selectbox("País", paises)
+    st.caption(f"Status: {painel.atributos.at[pais, 'Status']}")
+    st.dataframe(painel.trajetoria(pais))
@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+
+class PainelPaises:
+    """Indicadores em um array denso país × ano × indicador.
+
+    Os anos cobrem todo o intervalo de ``Year`` (anos sem dado ficam NaN),
+    então o ano vira posição (``ano - ano_inicial``) e a trajetória de um país
+    é uma fatia contígua do array: trajetória, variação anual e média móvel
+    custam O(anos), sem filtrar o DataFrame a cada seleção.
+    """
+
+    def __init__(self, df: pd.DataFrame, coluna_pais: str = 'Country', coluna_ano: str = 'Year'):
+        numericas = df.select_dtypes(include=np.number).drop(columns=coluna_ano)
+        self.indicadores = list(numericas.columns)
+        self._coluna = {nome: k for k, nome in enumerate(self.indicadores)}
+
+        codigos_pais, self.paises = pd.factorize(df[coluna_pais], sort=True)
+        self._posicao = {pais: i for i, pais in enumerate(self.paises)}
+        anos = df[coluna_ano].to_numpy()
+        self.ano_inicial = int(anos.min())
+        self.anos = np.arange(self.ano_inicial, int(anos.max()) + 1)
+
+        self.valores = np.full((len(self.paises), len(self.anos), len(self.indicadores)), np.nan)
+        self.valores[codigos_pais, anos - self.ano_inicial] = numericas.to_numpy(dtype=np.float64)
+
+        # Demais colunas de texto (ex.: Status) pelo último ano de cada país
+        ultimo = df.sort_values(coluna_ano).drop_duplicates(coluna_pais, keep='last').set_index(coluna_pais)
+        self.atributos = ultimo.drop(columns=[coluna_ano, *self.indicadores]).reindex(self.paises)
+
+    def __contains__(self, pais: str) -> bool:
+        return pais in self._posicao
+
+    def _serie(self, pais: str, indicador: str) -> np.ndarray:
+        return self.valores[self._posicao[pais], :, self._coluna[indicador]]
+
+    def trajetoria(self, pais: str, indicadores: list = None) -> pd.DataFrame:
+        """Indicadores do país ano a ano (padrão: todos)."""
+        indicadores = indicadores or self.indicadores
+        bloco = self.valores[self._posicao[pais]][:, [self._coluna[i] for i in indicadores]]
+        return pd.DataFrame(bloco, index=pd.Index(self.anos, name='Ano'), columns=indicadores)
+
+    def variacao_anual(self, pais: str, indicador: str) -> pd.Series:
+        """Diferença para o ano anterior (NaN se faltar um dos dois anos)."""
+        serie = self._serie(pais, indicador)
+        delta = np.concatenate([[np.nan], np.diff(serie)])
+        return pd.Series(delta, index=pd.Index(self.anos, name='Ano'), name=indicador)
+
+    def media_movel(self, pais: str, indicador: str, janela: int) -> pd.Series:
+        """Média dos anos presentes na janela que termina em cada ano (somas acumuladas)."""
+        serie = self._serie(pais, indicador)
+        presente = ~np.isnan(serie)
+        soma = np.concatenate([[0.0], np.cumsum(np.where(presente, serie, 0.0))])
+        contagem = np.concatenate([[0], np.cumsum(presente)])
+        fim = np.arange(1, len(serie) + 1)
+        inicio = np.maximum(fim - janela, 0)
+        n = contagem[fim] - contagem[inicio]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            media = np.where(n > 0, (soma[fim] - soma[inicio]) / n, np.nan)
+        return pd.Series(media, index=pd.Index(self.anos, name='Ano'), name=indicador)
+
+    def comparar(self, paises: list, indicador: str) -> pd.DataFrame:
+        """Um indicador para vários países: anos nas linhas, países nas colunas."""
+        bloco = self.valores[[self._posicao[p] for p in paises], :, self._coluna[indicador]]
+        return pd.DataFrame(bloco.T, index=pd.Index(self.anos, name='Ano'), columns=paises)
+
+    def media_por_pais(self, indicador: str) -> pd.Series:
+        """Média do indicador ao longo dos anos de cada país (ignora anos sem dado)."""
+        bloco = self.valores[:, :, self._coluna[indicador]]
+        n = (~np.isnan(bloco)).sum(axis=1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            media = np.where(n > 0, np.nansum(bloco, axis=1) / n, np.nan)
+        return pd.Series(media, index=pd.Index(self.paises, name='Country'), name=indicador)
+
+
+# Uma vez por versão do arquivo, compartilhado entre sessões (somente leitura)
+@st.cache_resource(show_spinner=False, max_entries=2)
+def painel_paises(_df: pd.DataFrame, versao: str) -> PainelPaises:
+    return PainelPaises(_df)
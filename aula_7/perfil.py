@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+# Número de bits 1 em cada byte, para contar valores presentes direto nos bitmaps
+_BITS = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1)
+
+
+class PerfilFaltantes:
+    """Bitmaps de valores presentes, um por coluna, montados uma vez.
+
+    Cada coluna vira ``ceil(linhas / 8)`` bytes (``np.packbits``). Contagens
+    saem da soma de bits e as combinações de colunas são ANDs entre bitmaps,
+    sem varrer o DataFrame de novo a cada ``isnull``/``dropna``.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.colunas = list(df.columns)
+        self.linhas = len(df)
+        self._posicao = {c: k for k, c in enumerate(self.colunas)}
+        self.bitmaps = np.packbits(df.notna().to_numpy().T, axis=1)
+        self.presentes = pd.Series(_BITS[self.bitmaps].sum(axis=1), index=self.colunas)
+
+    def _bitmaps(self, colunas: list) -> np.ndarray:
+        return self.bitmaps[[self._posicao[c] for c in colunas]]
+
+    def percentual_faltante(self) -> pd.Series:
+        """Percentual de valores faltantes por coluna (equivale a ``df.isnull().mean() * 100``)."""
+        return (1 - self.presentes / self.linhas) * 100
+
+    def mascara_completa(self, colunas: list) -> np.ndarray:
+        """Máscara das linhas sem faltantes em ``colunas`` (o ``dropna(subset=colunas)`` como máscara)."""
+        bitmap = np.bitwise_and.reduce(self._bitmaps(colunas), axis=0)
+        return np.unpackbits(bitmap, count=self.linhas).astype(bool)
+
+    def validos(self, colunas: list) -> np.ndarray:
+        """Matriz linhas × colunas de valores presentes, desempacotada dos bitmaps."""
+        return np.unpackbits(self._bitmaps(colunas), axis=1, count=self.linhas).T.astype(bool)
+
+
+# Uma vez por versão do arquivo, compartilhado entre sessões (somente leitura)
+@st.cache_resource(show_spinner=False, max_entries=2)
+def perfil_faltantes(_df: pd.DataFrame, versao: str) -> PerfilFaltantes:
+    return PerfilFaltantes(_df)
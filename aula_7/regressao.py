@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+# Quantil da normal para o intervalo de confiança de 95%
+Z_95 = 1.959963984540054
+
+
+def quantil_t(graus_liberdade, z: float = Z_95):
+    """Quantil da t de Student a partir do quantil ``z`` da normal (expansão de Cornish-Fisher).
+
+    Erro abaixo de 1e-3 a partir de ~10 graus de liberdade, sem depender do scipy.
+    """
+    v = np.asarray(graus_liberdade, dtype=np.float64)
+    return (z
+            + (z**3 + z) / (4 * v)
+            + (5 * z**5 + 16 * z**3 + 3 * z) / (96 * v**2)
+            + (3 * z**7 + 19 * z**5 + 17 * z**3 - 15 * z) / (384 * v**3))
+
+
+def ajustar_regressoes(df: pd.DataFrame, colunas: list, alvo: str, presente: np.ndarray = None) -> pd.DataFrame:
+    """Reta de mínimos quadrados de ``alvo`` contra cada coluna, todas em uma passada.
+
+    Cada coluna usa só as linhas em que ela e o ``alvo`` têm valor. As somas
+    de todas as colunas saem de operações sobre a matriz inteira, sem laço
+    por coluna. Retorna uma linha por coluna com o necessário para a reta e
+    para a faixa de confiança analítica (``faixa_confianca``). ``presente``
+    (opcional) é a matriz linhas × colunas de pares (x, alvo) completos.
+    """
+    x = df[colunas].to_numpy(dtype=np.float64)
+    y = df[alvo].to_numpy(dtype=np.float64)[:, None]
+    if presente is None:
+        presente = ~np.isnan(x) & ~np.isnan(y)
+    p = presente.astype(np.float64)
+    x0 = np.where(presente, x, 0.0)
+    y0 = np.where(presente, y, 0.0)
+
+    n = p.sum(axis=0)
+    x_medio = x0.sum(axis=0) / n
+    y_medio = y0.sum(axis=0) / n
+    dx = np.where(presente, x - x_medio, 0.0)
+    dy = np.where(presente, y - y_medio, 0.0)
+    sxx = (dx * dx).sum(axis=0)
+    syy = (dy * dy).sum(axis=0)
+    sxy = (dx * dy).sum(axis=0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        inclinacao = sxy / sxx
+        residuo = np.maximum(syy - inclinacao * sxy, 0.0)
+        resultado = pd.DataFrame({
+            'n': n.astype(np.int64),
+            'inclinacao': inclinacao,
+            'intercepto': y_medio - inclinacao * x_medio,
+            'x_medio': x_medio,
+            'sxx': sxx,
+            # desvio padrão dos resíduos
+            'erro_padrao': np.sqrt(residuo / (n - 2)),
+            'r2': 1 - residuo / syy,
+            'x_min': np.nanmin(np.where(presente, x, np.nan), axis=0),
+            'x_max': np.nanmax(np.where(presente, x, np.nan), axis=0),
+        }, index=pd.Index(colunas, name='coluna'))
+    return resultado
+
+
+@st.cache_data(show_spinner=False)
+def regressoes(_df: pd.DataFrame, colunas: tuple, alvo: str, versao: str, _perfil=None) -> pd.DataFrame:
+    """``ajustar_regressoes`` em cache por (colunas, alvo, versão dos dados).
+
+    Com ``_perfil`` (perfil de faltantes), os pares completos vêm dos bitmaps.
+    """
+    presente = None
+    if _perfil is not None:
+        presente = _perfil.validos(list(colunas)) & _perfil.validos([alvo])
+    return ajustar_regressoes(_df, list(colunas), alvo, presente)
+
+
+def faixa_confianca(ajuste: pd.Series, x: np.ndarray, z: float = Z_95) -> tuple:
+    """Reta ajustada e limites do intervalo de confiança da média em cada ``x``."""
+    y = ajuste['intercepto'] + ajuste['inclinacao'] * x
+    margem = quantil_t(ajuste['n'] - 2, z) * ajuste['erro_padrao'] * np.sqrt(
+        1 / ajuste['n'] + (x - ajuste['x_medio'])**2 / ajuste['sxx']
+    )
+    return y, y - margem, y + margem
+
+
+def desenhar_regressao(ax, df: pd.DataFrame, x: str, y: str, ajuste: pd.Series, scatter: bool = True,
+                       scatter_kws: dict = None, line_kws: dict = None, label: str = None, pontos: int = 100):
+    """Pontos, reta e faixa de confiança de 95% de um ajuste já calculado (substitui o ``sns.regplot``)."""
+    # Próxima cor do ciclo do eixo, como o seaborn faz
+    cor = ax.plot([], [])[0]
+    cor.remove()
+    cor = cor.get_color()
+    if scatter:
+        ax.scatter(df[x], df[y], **{'color': cor, 's': 20, **(scatter_kws or {})})
+
+    grade = np.linspace(ajuste['x_min'], ajuste['x_max'], pontos)
+    y_hat, inferior, superior = faixa_confianca(ajuste, grade)
+    linha = {'color': cor, **(line_kws or {})}
+    ax.plot(grade, y_hat, label=label, **linha)
+    ax.fill_between(grade, inferior, superior, color=linha['color'], alpha=0.15, linewidth=0)
+    ax.set_xlabel(x)
+    ax.set_ylabel(y)
@@ -0,0 +1,48 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Os módulos da aula são importados pelo nome, como em main.py
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from correlacao import MatrizCorrelacao  # noqa: E402
+from perfil import PerfilFaltantes  # noqa: E402
+
+
+def _dados_com_faltantes(semente: int) -> pd.DataFrame:
+    rng = np.random.default_rng(semente)
+    n = 400
+    base = rng.normal(size=n)
+    df = pd.DataFrame({
+        'a': base + rng.normal(scale=0.5, size=n),
+        'b': np.exp(base) + rng.normal(scale=0.3, size=n),
+        'c': rng.integers(0, 5, size=n).astype(float),  # muitos empates
+        'd': -base ** 3,
+        'e': rng.normal(size=n),
+    })
+    # Faltantes em linhas diferentes em cada coluna
+    for k, coluna in enumerate(df.columns):
+        df.loc[rng.random(n) < 0.05 * (k + 1), coluna] = np.nan
+    return df
+
+
+@pytest.mark.parametrize('semente', [0, 1, 2])
+def test_spearman_igual_ao_pandas_com_faltantes(semente):
+    df = _dados_com_faltantes(semente)
+    matriz = MatrizCorrelacao(df)
+    np.testing.assert_allclose(matriz.spearman, df.corr(method='spearman'), atol=1e-12)
+
+
+def test_spearman_com_perfil_de_faltantes():
+    df = _dados_com_faltantes(3)
+    matriz = MatrizCorrelacao(df, PerfilFaltantes(df))
+    for a, b in [('a', 'b'), ('c', 'e'), ('b', 'd')]:
+        esperado = df[[a, b]].corr(method='spearman').iloc[0, 1]
+        assert matriz.par(a, b, 'spearman') == pytest.approx(esperado, abs=1e-12)
+
+
+def test_pearson_igual_ao_pandas_com_faltantes():
+    df = _dados_com_faltantes(4)
+    np.testing.assert_allclose(MatrizCorrelacao(df).pearson, df.corr(), atol=1e-12)
@@ -0,0 +1,73 @@
+import re
+
+import streamlit as st
+
+from db import query
+
+# Quantidade máxima de sugestões devolvidas por busca
+LIMITE_SUGESTOES = 20
+
+BUSCA_LIVROS = """
+SELECT l.id, l.titulo || ' — ' || COALESCE(a.nome, '?') AS rotulo
+FROM livros_fts f
+JOIN livros l ON l.id = f.rowid
+LEFT JOIN autores a ON a.id = l.autor_id
+WHERE livros_fts MATCH ?
+ORDER BY f.rank
+LIMIT ?
+"""
+
+# Sem texto digitado: os primeiros títulos em ordem alfabética (usa idx_livros_titulo)
+PRIMEIROS_LIVROS = """
+SELECT l.id, l.titulo || ' — ' || COALESCE(a.nome, '?') AS rotulo
+FROM livros l
+LEFT JOIN autores a ON a.id = l.autor_id
+ORDER BY l.titulo
+LIMIT ?
+"""
+
+BUSCA_AUTORES = """
+SELECT a.id, a.nome AS rotulo
+FROM autores_fts f
+JOIN autores a ON a.id = f.rowid
+WHERE autores_fts MATCH ?
+ORDER BY f.rank
+LIMIT ?
+"""
+
+PRIMEIROS_AUTORES = "SELECT id, nome AS rotulo FROM autores ORDER BY nome LIMIT ?"
+
+
+def expressao_fts(texto: str) -> str:
+    """Converte o texto digitado em uma consulta FTS5 de prefixos: 'harr pot' -> '"harr"* "pot"*'."""
+    termos = re.findall(r"\w+", texto)
+    return " ".join(f'"{termo}"*' for termo in termos)
+
+
+def _buscar(sql_busca: str, sql_primeiros: str, texto: str, limite: int) -> dict:
+    expressao = expressao_fts(texto)
+    if expressao:
+        df = query(sql_busca, (expressao, limite))
+    else:
+        df = query(sql_primeiros, (limite,))
+    return dict(zip(df["id"].tolist(), df["rotulo"]))
+
+
+def buscar_livros(texto: str, limite: int = LIMITE_SUGESTOES) -> dict:
+    return _buscar(BUSCA_LIVROS, PRIMEIROS_LIVROS, texto, limite)
+
+
+def buscar_autores(texto: str, limite: int = LIMITE_SUGESTOES) -> dict:
+    return _buscar(BUSCA_AUTORES, PRIMEIROS_AUTORES, texto, limite)
+
+
+def campo_busca(label: str, key: str) -> str:
+    # Fica fora do st.form: dentro dele o texto só seria aplicado no submit
+    return st.text_input(f"🔎 Buscar {label.lower()}", key=key, placeholder="Digite parte do nome")
+
+
+def seletor(label: str, sugestoes: dict, key: str, opcional: bool = False):
+    """Selectbox com as sugestões da busca; devolve o id escolhido (ou None)."""
+    ids = ([None] if opcional else []) + list(sugestoes)
+    return st.selectbox(label, ids, key=key,
+                        format_func=lambda id_: "" if id_ is None else sugestoes[id_])
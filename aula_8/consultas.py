@@ -0,0 +1,53 @@
+# Consultas de leitura usadas pelo dashboard da biblioteca.
+# Ficam centralizadas aqui para que a página de plano de consultas audite
+# exatamente o mesmo SQL que o dashboard executa.
+
+INTERVALO_DE_ANOS = "SELECT MIN(ano) AS min_year, MAX(ano) AS max_year FROM livros"
+
+LIVROS_POR_ANO = """
+SELECT
+  l.id,
+  l.titulo,
+  a.nome      AS Autor,
+  c.nome      AS Categoria,
+  l.ano,
+  l.quantidade_disponivel AS Disponíveis
+FROM livros l
+JOIN autores a ON l.autor_id = a.id
+JOIN categorias c ON l.categoria_id = c.id
+WHERE l.ano BETWEEN ? AND ?
+ORDER BY l.ano
+"""
+
+# Todos os indicadores do dashboard em uma única consulta. Os totais vêm da
+# tabela "totais", mantida por triggers (leitura O(1)); só os atrasados
+# são contados, por faixa do índice (devolvido, data_emprestimo).
+# Total de livros é o acervo: exemplares em estoque mais os emprestados, que
+# já saíram de "quantidade_disponivel" (só os de livros que ainda existem).
+METRICAS = """
+SELECT
+    t.estoque + t.acervo_emprestado AS total_livros,
+    t.emprestimos  AS total_emprestimos,
+    t.devolvidos   AS total_devolvidos,
+    t.emprestados  AS emprestados,
+    (SELECT COUNT(*) FROM emprestimos
+     WHERE devolvido = 0 AND data_emprestimo < ?) AS atrasados
+FROM totais t
+"""
+
+LIVROS_POR_CATEGORIA = """
+SELECT
+    c.nome AS Categoria,
+    COUNT(l.id) AS Total_Livros
+FROM categorias c
+LEFT JOIN livros l ON c.id = l.categoria_id
+GROUP BY c.id
+"""
+
+# Nome exibido na auditoria -> (SQL, parâmetros de exemplo)
+CONSULTAS = {
+    "Intervalo de anos": (INTERVALO_DE_ANOS, ()),
+    "Livros por ano": (LIVROS_POR_ANO, (1990, 2000)),
+    "Indicadores": (METRICAS, ("2025-01-01",)),
+    "Livros por categoria": (LIVROS_POR_CATEGORIA, ()),
+}
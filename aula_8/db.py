@@ -0,0 +1,142 @@
+import re
+import sqlite3
+import threading
+from collections import OrderedDict, defaultdict
+from contextlib import contextmanager
+
+import pandas as pd
+import streamlit as st
+
+from schema import TRIGGER_TARGETS, migrate
+
+DB_PATH = 'aula_8/biblioteca.db'
+
+# Tabelas lidas por uma consulta: tudo que aparece depois de FROM ou JOIN
+_TABLES_RE = re.compile(r"\b(?:FROM|JOIN)\s+([A-Za-z_]\w*)", re.IGNORECASE)
+
+
+def tables_in(sql: str) -> tuple:
+    return tuple(sorted({nome.lower() for nome in _TABLES_RE.findall(sql)}))
+
+
+class QueryCache:
+    """Cache de resultados de SELECT, chaveado pelo SQL e pelos parâmetros.
+
+    Cada tabela tem um contador de versão que as escritas incrementam. Uma
+    entrada guarda as versões das tabelas que leu e só é servida enquanto
+    nenhuma delas mudou. Os DataFrames são compartilhados entre sessões e
+    não devem ser modificados por quem os recebe.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._versions = defaultdict(int)
+        self._entries = OrderedDict()
+
+    def get(self, conn: sqlite3.Connection, sql: str, params: tuple = ()) -> pd.DataFrame:
+        return self.cached("df", sql, params, lambda: pd.read_sql_query(sql, conn, params=params))
+
+    def get_row(self, conn: sqlite3.Connection, sql: str, params: tuple = ()) -> tuple:
+        # Para consultas de uma única linha, sem montar DataFrame
+        return self.cached("row", sql, params, lambda: conn.execute(sql, params).fetchone())
+
+    def cached(self, kind: str, sql: str, params: tuple, load):
+        """Serve o resultado de ``load()`` em cache; ``kind`` separa formatos do mesmo SQL."""
+        key = (kind, sql, tuple(params))
+        tabelas = tables_in(sql)
+        with self._lock:
+            versoes = tuple(self._versions[t] for t in tabelas)
+            entrada = self._entries.get(key)
+            if entrada is not None and entrada[0] == versoes:
+                self._entries.move_to_end(key)
+                return entrada[1]
+
+        # A leitura acontece fora do lock; se uma escrita ocorrer no meio,
+        # as versões guardadas ficam desatualizadas e a próxima leitura refaz a consulta
+        resultado = load()
+        with self._lock:
+            self._entries[key] = (versoes, resultado)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return resultado
+
+    def invalidate(self, *tables: str):
+        with self._lock:
+            for tabela in tables:
+                self._versions[tabela.lower()] += 1
+
+
+class ConnectionPool:
+    """Pool de conexões SQLite compartilhado pelo processo do servidor.
+
+    O banco roda em modo WAL: cada sessão do Streamlit recebe a sua própria
+    conexão de leitura (leitores não bloqueiam o escritor) e todas as escritas
+    passam por uma única conexão protegida por um lock.
+    """
+
+    def __init__(self, path: str = DB_PATH):
+        self.path = path
+        self._write_lock = threading.Lock()
+        self._writer = self._connect()
+        self._writer.execute("PRAGMA journal_mode=WAL")
+        self.cache = QueryCache()
+
+    def _connect(self) -> sqlite3.Connection:
+        # check_same_thread=False: cada rerun do Streamlit pode rodar em uma thread diferente
+        conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA busy_timeout = 30000")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        return conn
+
+    def open_reader(self) -> sqlite3.Connection:
+        conn = self._connect()
+        conn.execute("PRAGMA query_only = ON")
+        return conn
+
+    @contextmanager
+    def writer(self, *tables: str):
+        """Transação de escrita serializada: BEGIN IMMEDIATE ... COMMIT/ROLLBACK.
+
+        ``tables`` são as tabelas alteradas; após o COMMIT as leituras em
+        cache que dependem delas deixam de ser servidas.
+        """
+        with self._write_lock:
+            self._writer.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._writer.cursor()
+            except BaseException:
+                self._writer.execute("ROLLBACK")
+                raise
+            else:
+                self._writer.execute("COMMIT")
+                # Inclui as tabelas que os triggers alteram junto com as escritas
+                afetadas = set(tables)
+                for tabela in tables:
+                    afetadas.update(TRIGGER_TARGETS.get(tabela, ()))
+                self.cache.invalidate(*afetadas)
+
+
+@st.cache_resource(show_spinner=False)
+def get_pool() -> ConnectionPool:
+    # Criado uma única vez por processo do servidor, já com o schema atualizado
+    pool = ConnectionPool(DB_PATH)
+    migrate(pool)
+    return pool
+
+
+def get_reader() -> sqlite3.Connection:
+    # Conexão de leitura própria da sessão; é descartada junto com a sessão
+    if "db_reader" not in st.session_state:
+        st.session_state["db_reader"] = get_pool().open_reader()
+    return st.session_state["db_reader"]
+
+
+def query(sql: str, params: tuple = ()) -> pd.DataFrame:
+    # Leitura servida pelo cache do processo, usando a conexão da sessão
+    return get_pool().cache.get(get_reader(), sql, params)
+
+
+def query_row(sql: str, params: tuple = ()) -> tuple:
+    return get_pool().cache.get_row(get_reader(), sql, params)
@@ -0,0 +1,74 @@
+from datetime import date
+
+from busca import expressao_fts
+from db import query
+
+
+class EstoqueEsgotado(Exception):
+    """Não há exemplar disponível do livro para emprestar."""
+
+
+class EmprestimoJaDevolvido(Exception):
+    """O empréstimo não existe ou já foi devolvido."""
+
+
+EMPRESTIMOS_ABERTOS = """
+SELECT e.id, l.titulo || ' — emprestado em ' || e.data_emprestimo AS rotulo
+FROM emprestimos e
+JOIN livros l ON l.id = e.livro_id
+WHERE e.devolvido = 0
+ORDER BY e.data_emprestimo
+LIMIT ?
+"""
+
+EMPRESTIMOS_ABERTOS_POR_TITULO = """
+SELECT e.id, l.titulo || ' — emprestado em ' || e.data_emprestimo AS rotulo
+FROM livros_fts f
+JOIN livros l ON l.id = f.rowid
+JOIN emprestimos e ON e.livro_id = l.id
+WHERE livros_fts MATCH ? AND e.devolvido = 0
+ORDER BY e.data_emprestimo
+LIMIT ?
+"""
+
+
+def emprestar(pool, livro_id: int, data_emprestimo: date) -> int:
+    """Registra um empréstimo e retira um exemplar do estoque na mesma transação.
+
+    A baixa é um UPDATE condicional (só com estoque > 0) dentro de BEGIN IMMEDIATE,
+    então dois empréstimos simultâneos nunca levam o último exemplar duas vezes.
+    """
+    with pool.writer("livros", "emprestimos") as cursor:
+        cursor.execute("""
+            UPDATE livros SET quantidade_disponivel = quantidade_disponivel - 1
+            WHERE id = ? AND quantidade_disponivel > 0
+        """, (livro_id,))
+        if cursor.rowcount == 0:
+            raise EstoqueEsgotado(livro_id)
+        cursor.execute("""
+            INSERT INTO emprestimos (livro_id, data_emprestimo, devolvido)
+            VALUES (?, ?, 0)
+        """, (livro_id, data_emprestimo.strftime("%Y-%m-%d")))
+        return cursor.lastrowid
+
+
+def devolver(pool, emprestimo_id: int):
+    """Marca o empréstimo como devolvido e devolve o exemplar ao estoque."""
+    with pool.writer("livros", "emprestimos") as cursor:
+        cursor.execute("UPDATE emprestimos SET devolvido = 1 WHERE id = ? AND devolvido = 0", (emprestimo_id,))
+        if cursor.rowcount == 0:
+            raise EmprestimoJaDevolvido(emprestimo_id)
+        cursor.execute("""
+            UPDATE livros SET quantidade_disponivel = quantidade_disponivel + 1
+            WHERE id = (SELECT livro_id FROM emprestimos WHERE id = ?)
+        """, (emprestimo_id,))
+
+
+def buscar_abertos(texto: str, limite: int = 20) -> dict:
+    """Empréstimos ainda não devolvidos, filtrados pelo título do livro (mais antigos primeiro)."""
+    expressao = expressao_fts(texto)
+    if expressao:
+        df = query(EMPRESTIMOS_ABERTOS_POR_TITULO, (expressao, limite))
+    else:
+        df = query(EMPRESTIMOS_ABERTOS, (limite,))
+    return dict(zip(df["id"].tolist(), df["rotulo"]))
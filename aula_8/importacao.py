@@ -0,0 +1,119 @@
+import csv
+import sqlite3
+from typing import NamedTuple
+
+import pandas as pd
+
+from lookups import AUTORES, CATEGORIAS, Lookup
+
+# Colunas esperadas no arquivo de importação (autor e categoria pelo nome)
+COLUNAS = ["titulo", "autor", "categoria", "ano", "quantidade_disponivel"]
+TEXTOS = ["titulo", "autor", "categoria"]
+INTEIROS = ["ano", "quantidade_disponivel"]
+TAMANHO_LOTE = 10_000
+
+INSERIR_LIVRO = """
+INSERT INTO livros (titulo, autor_id, categoria_id, ano, quantidade_disponivel)
+VALUES (?, ?, ?, ?, ?)
+"""
+
+EXPORTACAO = """
+SELECT
+    l.id,
+    l.titulo,
+    a.nome      AS autor,
+    c.nome      AS categoria,
+    l.ano,
+    l.quantidade_disponivel
+FROM livros l
+LEFT JOIN autores a ON l.autor_id = a.id
+LEFT JOIN categorias c ON l.categoria_id = c.id
+ORDER BY l.id
+"""
+
+
+class ResultadoImportacao(NamedTuple):
+    importados: int
+    rejeitados: int  # linhas com coluna obrigatória vazia ou número inválido
+
+
+def ler_lotes(arquivo, nome: str, tamanho_lote: int = TAMANHO_LOTE):
+    """Lê um CSV ou Parquet em lotes de ``tamanho_lote`` linhas, sem carregar o arquivo inteiro."""
+    if nome.lower().endswith(".parquet"):
+        # pyarrow só é necessário para importar Parquet
+        import pyarrow.parquet as pq
+        for lote in pq.ParquetFile(arquivo).iter_batches(batch_size=tamanho_lote, columns=COLUNAS):
+            yield lote.to_pandas()
+    else:
+        yield from pd.read_csv(arquivo, usecols=COLUNAS, chunksize=tamanho_lote)
+
+
+def _validar(lote: pd.DataFrame) -> pd.DataFrame:
+    """Normaliza o lote (textos sem espaços nas pontas, números convertidos) e devolve só as linhas válidas.
+
+    São inválidas as linhas com texto vazio ou com ``ano``/``quantidade_disponivel``
+    ausente, não numérico ou não inteiro.
+    """
+    colunas = {c: lote[c].astype("string").str.strip() for c in TEXTOS}
+    colunas.update({c: pd.to_numeric(lote[c], errors="coerce") for c in INTEIROS})
+    normalizado = pd.DataFrame(colunas, index=lote.index)
+    validas = pd.Series(True, index=lote.index)
+    for coluna in TEXTOS:
+        validas &= normalizado[coluna].fillna("").ne("")
+    for coluna in INTEIROS:
+        validas &= normalizado[coluna].mod(1).eq(0)
+    return normalizado[validas]
+
+
+def _resolver_ids(cursor: sqlite3.Cursor, tabela: str, nomes: pd.Series, ids_por_nome: dict) -> pd.Series:
+    # Nomes ainda desconhecidos são cadastrados na mesma transação
+    for nome in nomes.drop_duplicates():
+        if nome not in ids_por_nome:
+            cursor.execute(f"INSERT INTO {tabela} (nome) VALUES (?)", (nome,))
+            ids_por_nome[nome] = cursor.lastrowid
+    return nomes.map(ids_por_nome)
+
+
+def importar_livros(pool, lotes, progresso=None) -> ResultadoImportacao:
+    """Importa os lotes em uma única transação, com executemany por lote.
+
+    Autores e categorias são resolvidos para ids por dicionários em memória,
+    lidos pelo cursor de escrita de ``pool`` (o mesmo banco e a mesma transação).
+    Linhas inválidas (ver ``_validar``) não são gravadas e entram na contagem
+    de ``rejeitados``. ``progresso`` recebe o total de linhas já
+    importadas após cada lote. Se qualquer lote falhar, nada é gravado.
+    """
+    total = rejeitados = 0
+    with pool.writer("livros", "autores", "categorias") as cursor:
+        autores = Lookup(cursor.execute(AUTORES).fetchall()).ids_por_nome
+        categorias = Lookup(cursor.execute(CATEGORIAS).fetchall()).ids_por_nome
+        for lote in lotes:
+            validas = _validar(lote)
+            rejeitados += len(lote) - len(validas)
+            lote = validas
+            autor_ids = _resolver_ids(cursor, "autores", lote["autor"], autores)
+            categoria_ids = _resolver_ids(cursor, "categorias", lote["categoria"], categorias)
+            linhas = zip(
+                lote["titulo"].tolist(),
+                autor_ids.astype(int).tolist(),
+                categoria_ids.astype(int).tolist(),
+                lote["ano"].astype(int).tolist(),
+                lote["quantidade_disponivel"].astype(int).tolist(),
+            )
+            cursor.executemany(INSERIR_LIVRO, linhas)
+            total += len(lote)
+            if progresso:
+                progresso(total)
+    return ResultadoImportacao(total, rejeitados)
+
+
+def exportar_csv(conn: sqlite3.Connection, destino, tamanho_lote: int = TAMANHO_LOTE) -> int:
+    """Escreve o catálogo em ``destino`` (arquivo texto) lendo o banco em lotes com fetchmany."""
+    cursor = conn.execute(EXPORTACAO)
+    escritor = csv.writer(destino)
+    escritor.writerow([coluna[0] for coluna in cursor.description])
+    total = 0
+    while lote := cursor.fetchmany(tamanho_lote):
+        escritor.writerows(lote)
+        total += len(lote)
+    return total
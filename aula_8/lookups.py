@@ -0,0 +1,48 @@
+from collections import Counter
+
+from db import get_pool, get_reader
+
+AUTORES = "SELECT id, nome FROM autores ORDER BY nome"
+CATEGORIAS = "SELECT id, nome FROM categorias ORDER BY nome"
+
+
+class Lookup:
+    """Índices id -> nome e nome -> id de uma tabela pequena de referência.
+
+    Os selectboxes recebem ``ids`` como opções e ``rotulo`` como format_func,
+    então o valor escolhido já é o id, sem busca reversa pelo nome.
+    """
+
+    def __init__(self, linhas: list):
+        self.nomes = dict(linhas)
+        self.ids = list(self.nomes)
+        repetidos = Counter(self.nomes.values())
+        self._duplicados = {nome for nome, n in repetidos.items() if n > 1}
+        # Para nomes repetidos fica o primeiro id; use o id sempre que possível
+        self.ids_por_nome = {}
+        for id_, nome in linhas:
+            self.ids_por_nome.setdefault(nome, id_)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def rotulo(self, id_) -> str:
+        if id_ is None:
+            return ""
+        nome = self.nomes[id_]
+        # Nomes repetidos ganham o id no rótulo
+        return f"{nome} (#{id_})" if nome in self._duplicados else nome
+
+
+def _lookup(sql: str) -> Lookup:
+    # Montado uma vez e mantido no cache até uma escrita alterar a tabela
+    conn = get_reader()
+    return get_pool().cache.cached("lookup", sql, (), lambda: Lookup(conn.execute(sql).fetchall()))
+
+
+def autores() -> Lookup:
+    return _lookup(AUTORES)
+
+
+def categorias() -> Lookup:
+    return _lookup(CATEGORIAS)
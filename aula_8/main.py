@@ -1,122 +1,13 @@
 import streamlit as st
-import pandas as pd
-import sqlite3
+import consultas
+import lookups
+from emprestimos import EmprestimoJaDevolvido, EstoqueEsgotado, buscar_abertos, devolver, emprestar
+from busca import buscar_autores, buscar_livros, campo_busca, seletor
+from db import get_pool, query
+from paginacao import tabela_paginada
+from metricas import PRAZO_EMPRESTIMO_DIAS, get_metricas
 #streamlit run aula_8/main.py
-conn = sqlite3.connect('aula_8/biblioteca.db')
-cursor = conn.cursor()
-
-cursor.execute('''
-CREATE TABLE IF NOT EXISTS autores (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    nome TEXT NOT NULL
-)
-''')
-conn.commit()
-
-cursor.execute('''
-CREATE TABLE IF NOT EXISTS categorias (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    nome TEXT NOT NULL
-)
-''')
-conn.commit()
-
-cursor.execute('''
-CREATE TABLE IF NOT EXISTS livros (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    titulo TEXT NOT NULL,
-    autor_id INTEGER NOT NULL,
-    categoria_id INTEGER NOT NULL,
-    ano INTEGER NOT NULL,
-    quantidade_disponivel INTEGER NOT NULL,
-    FOREIGN KEY (autor_id) REFERENCES autores(id),
-    FOREIGN KEY (categoria_id) REFERENCES categorias(id)
-)
-''')
-conn.commit()
-
-cursor.execute('''
-CREATE TABLE IF NOT EXISTS emprestimos (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    livro_id INTEGER NOT NULL,
-    data_emprestimo TEXT NOT NULL,
-    devolvido boolean NOT NULL,
-    FOREIGN KEY (livro_id) REFERENCES livros(id)
-)
-''')
-conn.commit()
-
-# Insere dados fictícios nas tabelas
-
-# Exemplo para inserção dos autores
-cursor.execute("SELECT COUNT(*) FROM autores")
-if cursor.fetchone()[0] == 0:
-    autores = [
-        ("J.K. Rowling",),
-        ("George R. R. Martin",),
-        ("J.R.R. Tolkien",),
-        ("Agatha Christie",),
-        ("Stephen King",)
-    ]
-    cursor.executemany("INSERT INTO autores (nome) VALUES (?)", autores)
-    conn.commit()
-
-# Exemplo para inserção das categorias
-cursor.execute("SELECT COUNT(*) FROM categorias")
-if cursor.fetchone()[0] == 0:
-    categorias = [
-        ("Fantasia",),
-        ("Mistério",),
-        ("Terror",),
-        ("Ficção Científica",),
-        ("Romance",)
-    ]
-    cursor.executemany("INSERT INTO categorias (nome) VALUES (?)", categorias)
-    conn.commit()
-
-# Exemplo para inserção dos livros (pelo menos 10)
-cursor.execute("SELECT COUNT(*) FROM livros")
-if cursor.fetchone()[0] == 0:
-    livros = [
-        ("Harry Potter and the Sorcerer's Stone", 1, 1, 1997, 5),
-        ("Harry Potter and the Chamber of Secrets", 1, 1, 1998, 4),
-        ("A Game of Thrones", 2, 1, 1996, 3),
-        ("A Clash of Kings", 2, 1, 1998, 3),
-        ("The Hobbit", 3, 1, 1937, 6),
-        ("The Lord of the Rings", 3, 1, 1954, 5),
-        ("Murder on the Orient Express", 4, 2, 1934, 4),
-        ("And Then There Were None", 4, 2, 1939, 4),
-        ("The Shining", 5, 3, 1977, 5),
-        ("It", 5, 3, 1986, 4),
-        ("Carrie", 5, 3, 1974, 3),
-        ("Misery", 5, 3, 1987, 2)
-    ]
-    cursor.executemany("""
-        INSERT INTO livros (titulo, autor_id, categoria_id, ano, quantidade_disponivel)
-        VALUES (?, ?, ?, ?, ?)
-    """, livros)
-    conn.commit()
-
-# Exemplo para inserção dos empréstimos
-cursor.execute("SELECT COUNT(*) FROM emprestimos")
-if cursor.fetchone()[0] == 0:
-    emprestimos = [
-        (1, "2025-05-27", 0),
-        (2, "2025-05-26", 1),
-        (3, "2025-05-25", 0),
-        (4, "2025-05-24", 1),
-        (5, "2025-05-23", 0),
-        (6, "2025-05-22", 1),
-        (7, "2025-05-21", 0),
-        (8, "2025-05-20", 1),
-        (9, "2025-05-19", 0),
-        (10, "2025-05-18", 1)
-    ]
-    cursor.executemany("""
-        INSERT INTO emprestimos (livro_id, data_emprestimo, devolvido)
-        VALUES (?, ?, ?)
-    """, emprestimos)
-    conn.commit()
+pool = get_pool()
 
 st.set_page_config(page_title="Biblioteca", layout="wide")
 st.title("🌍 Biblioteca Senai")
@@ -125,27 +16,12 @@ st.divider()
 # ===== Atividade 1 =====
 st.subheader("Todos os livros com nome do autor e da categoria.")
 
-# Busca todos os livros com autor e categoria
-query = """
-SELECT 
-    l.id,
-    l.titulo,
-    a.nome      AS Autor,
-    c.nome      AS Categoria
-    FROM livros l
-    INNER JOIN autores a
-  ON l.autor_id = a.id
-    INNER JOIN categorias c
-  ON l.categoria_id = c.id;
-"""
-df_livros = pd.read_sql_query(query, conn)
-
-# Exibe em uma tabela interativa
-st.dataframe(df_livros)
+# Tabela paginada: busca, ordenação e paginação acontecem no banco
+tabela_paginada("livros")
 
 # ===== Atividade 2 =====
 #Filtro de livros por ano de publicação, utilize o slider do streamlit.
-years = pd.read_sql_query("SELECT MIN(ano) AS min_year, MAX(ano) AS max_year FROM livros", conn)
+years = query(consultas.INTERVALO_DE_ANOS)
 min_year = int(years.loc[0, 'min_year'])
 max_year = int(years.loc[0, 'max_year'])
 st.divider()
@@ -158,21 +34,7 @@ ano_inicio, ano_fim = st.slider(
 )
 
 # 3) Leitura e filtro dos dados
-query = """
-SELECT 
-  l.id,
-  l.titulo,
-  a.nome      AS Autor,
-  c.nome      AS Categoria,
-  l.ano,
-  l.quantidade_disponivel AS Disponíveis
-FROM livros l
-JOIN autores a ON l.autor_id = a.id
-JOIN categorias c ON l.categoria_id = c.id
-WHERE l.ano BETWEEN ? AND ?
-ORDER BY l.ano
-"""
-df = pd.read_sql_query(query, conn, params=(ano_inicio, ano_fim))
+df = query(consultas.LIVROS_POR_ANO, (ano_inicio, ano_fim))
 
 # 4) Exibe o resultado filtrado
 st.text(f"Livros publicados de {ano_inicio} até {ano_fim}")
@@ -184,38 +46,21 @@ st.divider()
 # Quantidade total de livros, de empréstimos e devolvidos.
 st.subheader("Quantidade total de livros, de empréstimos e devolvidos.")
 
-# Total de livros é a soma da coluna "quantidade_disponivel"
-query_total_livros = "SELECT SUM(quantidade_disponivel) AS total_livros FROM livros"
-total_livros = pd.read_sql_query(query_total_livros, conn).iloc[0]['total_livros']
-
-query_total_emprestimos = "SELECT COUNT(*) AS total_emprestimos FROM emprestimos"
-total_emprestimos = pd.read_sql_query(query_total_emprestimos, conn).iloc[0]['total_emprestimos']
+# Todos os indicadores vêm de uma única consulta
+metricas = get_metricas()
 
-query_total_devolvidos = """
-SELECT COUNT(*) AS total_devolvidos
-FROM emprestimos
-WHERE devolvido = 1
-"""
-total_devolvidos = pd.read_sql_query(query_total_devolvidos, conn).iloc[0]['total_devolvidos']
-
-col1, col2, col3 = st.columns(3)
-col1.metric("Total de livros", f"{total_livros}")
-col2.metric("Total de empréstimos", f"{total_emprestimos}")
-col3.metric("Total de livros devolvidos", f"{total_devolvidos}")
+col1, col2, col3, col4, col5 = st.columns(5)
+col1.metric("Total de livros", f"{metricas.total_livros}")
+col2.metric("Total de empréstimos", f"{metricas.total_emprestimos}")
+col3.metric("Total de livros devolvidos", f"{metricas.total_devolvidos}")
+col4.metric("Emprestados no momento", f"{metricas.emprestados}")
+col5.metric(f"Atrasados (+{PRAZO_EMPRESTIMO_DIAS} dias)", f"{metricas.atrasados}")
 
 st.divider()
 # ===== Atividade 4 =====
 # Número de livros por categoria (agrupado).
 st.subheader("Número de livros por categoria (agrupado).")
-query_categoria = """
-SELECT 
-    c.nome AS Categoria,
-    COUNT(l.id) AS Total_Livros
-FROM categorias c
-LEFT JOIN livros l ON c.id = l.categoria_id
-GROUP BY c.id
-"""
-df_categoria = pd.read_sql_query(query_categoria, conn)
+df_categoria = query(consultas.LIVROS_POR_CATEGORIA)
 st.dataframe(df_categoria)
 
 st.divider()
@@ -223,24 +68,15 @@ st.divider()
 # ===== Atividade 5 =====
 # Formulário para inserir um novo Livro
 st.subheader("➕ Inserir novo Livro")
+termo_autor = campo_busca("Autor", "busca_autor_novo_livro")
 with st.form("form_novo_livro"):
     titulo = st.text_input("Título do Livro")
     
-    # Busca autores disponíveis
-    autores_df = pd.read_sql_query("SELECT id, nome FROM autores", conn)
-    autor_option = st.selectbox("Autor", [""] + autores_df["nome"].tolist())
-    if autor_option:
-        autor_id = int(autores_df[autores_df["nome"] == autor_option]["id"].values[0])
-    else:
-        autor_id = None
+    # Autores vêm da busca por texto; categorias, do cache de lookups. O valor selecionado já é o id
+    autor_id = seletor("Autor", buscar_autores(termo_autor), "autor_novo_livro", opcional=True)
 
-    # Busca categorias disponíveis
-    categorias_df = pd.read_sql_query("SELECT id, nome FROM categorias", conn)
-    categoria_option = st.selectbox("Categoria", [""] + categorias_df["nome"].tolist())
-    if categoria_option:
-        categoria_id = int(categorias_df[categorias_df["nome"] == categoria_option]["id"].values[0])
-    else:
-        categoria_id = None
+    categorias = lookups.categorias()
+    categoria_id = st.selectbox("Categoria", [None] + categorias.ids, format_func=categorias.rotulo)
 
     ano = st.number_input("Ano de publicação", min_value=1, step=1)
     quantidade = st.number_input("Quantidade disponível", min_value=0, step=1)
@@ -249,11 +85,11 @@ with st.form("form_novo_livro"):
     
     if submit_livro:
         if titulo and autor_id and categoria_id and ano > 0 and quantidade >= 0:
-            cursor.execute("""
-                INSERT INTO livros (titulo, autor_id, categoria_id, ano, quantidade_disponivel)
-                VALUES (?, ?, ?, ?, ?)
-            """, (titulo, autor_id, categoria_id, int(ano), int(quantidade)))
-            conn.commit()
+            with pool.writer("livros") as cursor:
+                cursor.execute("""
+                    INSERT INTO livros (titulo, autor_id, categoria_id, ano, quantidade_disponivel)
+                    VALUES (?, ?, ?, ?, ?)
+                """, (titulo, autor_id, categoria_id, int(ano), int(quantidade)))
             st.success(f"Livro '{titulo}' inserido com sucesso!")
             st.rerun()
         else:
@@ -262,52 +98,69 @@ with st.form("form_novo_livro"):
 
 # Formulário para inserir um novo Empréstimo
 st.subheader("➕ Inserir novo Empréstimo")
+termo_livro = campo_busca("Livro", "busca_livro_emprestimo")
 with st.form("form_novo_emprestimo"):
     # Busca livros disponíveis
-    livros_df = pd.read_sql_query("SELECT id, titulo FROM livros", conn)
-    if not livros_df.empty:
-        livro_option = st.selectbox("Selecione o Livro", livros_df["titulo"].tolist())
-        livro_id = int(livros_df[livros_df["titulo"] == livro_option]["id"].values[0])
+    livros = buscar_livros(termo_livro)
+    if livros:
+        livro_id = seletor("Selecione o Livro", livros, "livro_emprestimo")
     else:
         st.error("Nenhum livro disponível para empréstimo.")
         livro_id = None
 
     data_emprestimo = st.date_input("Data do Empréstimo")
-    devolvido = st.checkbox("Já devolvido?", value=False)
     
     submit_emprestimo = st.form_submit_button("Registrar Empréstimo")
     
     if submit_emprestimo:
         if livro_id is not None:
-            data_str = data_emprestimo.strftime("%Y-%m-%d")
-            devolvido_int = 1 if devolvido else 0
-            cursor.execute("""
-                INSERT INTO emprestimos (livro_id, data_emprestimo, devolvido)
-                VALUES (?, ?, ?)
-            """, (livro_id, data_str, devolvido_int))
-            conn.commit()
-            st.success("Empréstimo registrado com sucesso!")
-            st.rerun()
+            try:
+                emprestar(pool, livro_id, data_emprestimo)
+            except EstoqueEsgotado:
+                st.error("Não há exemplares disponíveis deste livro.")
+            else:
+                st.success("Empréstimo registrado com sucesso!")
+                st.rerun()
         else:
             st.error("Selecione um livro válido para registrar o empréstimo.")
 
+# Formulário para registrar a devolução de um Empréstimo
+st.subheader("↩️ Registrar Devolução")
+termo_devolucao = campo_busca("Livro emprestado", "busca_devolucao")
+with st.form("form_devolucao"):
+    abertos = buscar_abertos(termo_devolucao)
+    if abertos:
+        emprestimo_id = seletor("Selecione o Empréstimo", abertos, "emprestimo_devolucao")
+        submit_devolucao = st.form_submit_button("Registrar Devolução")
+        if submit_devolucao:
+            try:
+                devolver(pool, emprestimo_id)
+            except EmprestimoJaDevolvido:
+                st.error("Este empréstimo já foi devolvido.")
+            else:
+                st.success("Devolução registrada com sucesso!")
+                st.rerun()
+    else:
+        st.info("Nenhum empréstimo em aberto.")
+        st.form_submit_button("Registrar Devolução", disabled=True)
+
 st.divider()
 
 # ===== Atividade 6 =====
 # Formulário para editar um autor (alterar o nome)
 st.subheader("✏️ Editar Autor")
+termo_autor = campo_busca("Autor", "busca_autor_editar")
 with st.form("form_editar_autor"):
     # Busca autores disponíveis
-    autores_df = pd.read_sql_query("SELECT id, nome FROM autores", conn)
-    if not autores_df.empty:
-        autor_option = st.selectbox("Selecione o Autor", autores_df["nome"].tolist())
+    autores = buscar_autores(termo_autor)
+    if autores:
+        autor_id = seletor("Selecione o Autor", autores, "autor_editar")
         novo_nome = st.text_input("Novo Nome do Autor")
         submit_editar = st.form_submit_button("Atualizar Autor")
         if submit_editar:
             if novo_nome.strip():
-                autor_id = int(autores_df[autores_df["nome"] == autor_option]["id"].values[0])
-                cursor.execute("UPDATE autores SET nome = ? WHERE id = ?", (novo_nome.strip(), autor_id))
-                conn.commit()
+                with pool.writer("autores") as cursor:
+                    cursor.execute("UPDATE autores SET nome = ? WHERE id = ?", (novo_nome.strip(), autor_id))
                 st.success(f"Autor atualizado para '{novo_nome}' com sucesso!")
                 st.rerun()
             else:
@@ -320,25 +173,18 @@ st.divider()
 # Formulário para editar um livro (alterar titulo, nome, categoria,
 # quantidade disponivel)
 st.subheader("✏️ Editar Livro")
+termo_livro = campo_busca("Livro", "busca_livro_editar")
+termo_autor = campo_busca("Autor", "busca_autor_editar_livro")
 with st.form("form_editar_livro"):
-    livros_df = pd.read_sql_query("SELECT id, titulo FROM livros", conn)
-    if not livros_df.empty:
-        livro_option = st.selectbox("Selecione o Livro", livros_df["titulo"].tolist())
+    livros = buscar_livros(termo_livro)
+    if livros:
+        livro_id = seletor("Selecione o Livro", livros, "livro_editar")
         novo_titulo = st.text_input("Novo Título do Livro")
         
-        autores_df = pd.read_sql_query("SELECT id, nome FROM autores", conn)
-        autor_option = st.selectbox("Autor", [""] + autores_df["nome"].tolist())
-        if autor_option:
-            autor_id = int(autores_df[autores_df["nome"] == autor_option]["id"].values[0])
-        else:
-            autor_id = None
+        autor_id = seletor("Autor", buscar_autores(termo_autor), "autor_editar_livro", opcional=True)
 
-        categorias_df = pd.read_sql_query("SELECT id, nome FROM categorias", conn)
-        categoria_option = st.selectbox("Categoria", [""] + categorias_df["nome"].tolist())
-        if categoria_option:
-            categoria_id = int(categorias_df[categorias_df["nome"] == categoria_option]["id"].values[0])
-        else:
-            categoria_id = None
+        categorias = lookups.categorias()
+        categoria_id = st.selectbox("Categoria", [None] + categorias.ids, format_func=categorias.rotulo)
 
         nova_quantidade = st.number_input("Nova Quantidade Disponível", min_value=0, step=1)
         
@@ -346,13 +192,12 @@ with st.form("form_editar_livro"):
         
         if submit_editar:
             if novo_titulo.strip() and autor_id and categoria_id and nova_quantidade >= 0:
-                livro_id = int(livros_df[livros_df["titulo"] == livro_option]["id"].values[0])
-                cursor.execute("""
-                    UPDATE livros 
-                    SET titulo = ?, autor_id = ?, categoria_id = ?, quantidade_disponivel = ?
-                    WHERE id = ?
-                """, (novo_titulo.strip(), autor_id, categoria_id, int(nova_quantidade), livro_id))
-                conn.commit()
+                with pool.writer("livros") as cursor:
+                    cursor.execute("""
+                        UPDATE livros 
+                        SET titulo = ?, autor_id = ?, categoria_id = ?, quantidade_disponivel = ?
+                        WHERE id = ?
+                    """, (novo_titulo.strip(), autor_id, categoria_id, int(nova_quantidade), livro_id))
                 st.success(f"Livro '{novo_titulo}' atualizado com sucesso!")
                 st.rerun()
             else:
@@ -365,16 +210,16 @@ st.divider()
 
 # Formulário para deletar um Livro
 st.subheader("🗑️ Deletar Livro")
+termo_livro = campo_busca("Livro", "busca_livro_deletar")
 with st.form("form_deletar_livro"):
-    livros_df = pd.read_sql_query("SELECT id, titulo FROM livros", conn)
-    if not livros_df.empty:
-        livro_option = st.selectbox("Selecione o Livro", livros_df["titulo"].tolist())
+    livros = buscar_livros(termo_livro)
+    if livros:
+        livro_id = seletor("Selecione o Livro", livros, "livro_deletar")
         submit_deletar_livro = st.form_submit_button("Deletar Livro")
         if submit_deletar_livro:
-            livro_id = int(livros_df[livros_df["titulo"] == livro_option]["id"].values[0])
-            cursor.execute("DELETE FROM livros WHERE id = ?", (livro_id,))
-            conn.commit()
-            st.success(f"Livro '{livro_option}' deletado com sucesso!")
+            with pool.writer("livros") as cursor:
+                cursor.execute("DELETE FROM livros WHERE id = ?", (livro_id,))
+            st.success(f"Livro '{livros[livro_id]}' deletado com sucesso!")
             st.rerun()
     else:
         st.error("Nenhum livro disponível para deletar.")
@@ -383,16 +228,16 @@ st.divider()
 
 # Formulário para deletar um Autor
 st.subheader("🗑️ Deletar Autor")
+termo_autor = campo_busca("Autor", "busca_autor_deletar")
 with st.form("form_deletar_autor"):
-    autores_df = pd.read_sql_query("SELECT id, nome FROM autores", conn)
-    if not autores_df.empty:
-        autor_option = st.selectbox("Selecione o Autor", autores_df["nome"].tolist())
+    autores = buscar_autores(termo_autor)
+    if autores:
+        autor_id = seletor("Selecione o Autor", autores, "autor_deletar")
         submit_deletar_autor = st.form_submit_button("Deletar Autor")
         if submit_deletar_autor:
-            autor_id = int(autores_df[autores_df["nome"] == autor_option]["id"].values[0])
-            cursor.execute("DELETE FROM autores WHERE id = ?", (autor_id,))
-            conn.commit()
-            st.success(f"Autor '{autor_option}' deletado com sucesso!")
+            with pool.writer("autores") as cursor:
+                cursor.execute("DELETE FROM autores WHERE id = ?", (autor_id,))
+            st.success(f"Autor '{autores[autor_id]}' deletado com sucesso!")
             st.rerun()
     else:
         st.error("Nenhum autor disponível para deletar.")
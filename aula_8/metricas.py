@@ -0,0 +1,24 @@
+from datetime import date, timedelta
+from typing import NamedTuple
+
+import consultas
+from db import query_row
+
+# Empréstimos não devolvidos há mais tempo que isso contam como atrasados
+PRAZO_EMPRESTIMO_DIAS = 14
+
+
+class Metricas(NamedTuple):
+    total_livros: int
+    total_emprestimos: int
+    total_devolvidos: int
+    emprestados: int
+    atrasados: int
+
+
+def get_metricas(hoje: date = None) -> Metricas:
+    """Indicadores do dashboard lidos de uma só consulta (e servidos do cache)."""
+    hoje = hoje or date.today()
+    # A data limite entra como parâmetro, então a entrada de cache muda a cada dia
+    data_limite = (hoje - timedelta(days=PRAZO_EMPRESTIMO_DIAS)).isoformat()
+    return Metricas(*query_row(consultas.METRICAS, (data_limite,)))
@@ -0,0 +1,58 @@
+import os
+import sqlite3
+import tempfile
+
+import streamlit as st
+from db import get_pool, get_reader
+from importacao import COLUNAS, TAMANHO_LOTE, exportar_csv, importar_livros, ler_lotes
+
+pool = get_pool()
+
+st.set_page_config(page_title="Importar e Exportar", layout="wide")
+st.title("📦 Importação e Exportação do Catálogo")
+st.divider()
+
+# ===== Importação =====
+st.subheader("⬆️ Importar livros em lote")
+st.markdown(
+    f"Arquivo CSV ou Parquet com as colunas `{'`, `'.join(COLUNAS)}`. "
+    "Autores e categorias são informados pelo nome; nomes novos são cadastrados automaticamente. "
+    "A importação roda em uma única transação: se algo falhar, nada é gravado."
+)
+arquivo = st.file_uploader("Arquivo", type=["csv", "parquet"])
+tamanho_lote = st.number_input("Linhas por lote", min_value=100, value=TAMANHO_LOTE, step=1000)
+
+if arquivo is not None and st.button("Importar"):
+    status = st.empty()
+    try:
+        resultado = importar_livros(
+            pool,
+            ler_lotes(arquivo, arquivo.name, int(tamanho_lote)),
+            progresso=lambda n: status.text(f"{n:,} linhas importadas...")
+        )
+    except (ValueError, KeyError, ImportError, sqlite3.Error) as erro:
+        status.empty()
+        st.error(f"Falha na importação, nenhuma linha foi gravada: {erro}")
+    else:
+        status.empty()
+        st.success(f"{resultado.importados:,} livros importados com sucesso!")
+        if resultado.rejeitados:
+            st.warning(f"{resultado.rejeitados:,} linhas ignoradas por terem colunas obrigatórias "
+                       "vazias ou números inválidos.")
+
+st.divider()
+
+# ===== Exportação =====
+st.subheader("⬇️ Exportar catálogo")
+if st.button("Gerar CSV"):
+    # O banco é lido em lotes e gravado em arquivo temporário, sem montar DataFrame;
+    # o botão recebe o arquivo aberto e o temporário é apagado logo depois
+    with tempfile.NamedTemporaryFile(mode="w", encoding="utf-8", newline="", suffix=".csv",
+                                     delete=False) as destino:
+        total = exportar_csv(get_reader(), destino)
+    try:
+        with open(destino.name, "rb") as arquivo_csv:
+            st.download_button("Baixar catalogo.csv", data=arquivo_csv, file_name="catalogo.csv", mime="text/csv")
+    finally:
+        os.remove(destino.name)
+    st.caption(f"{total:,} livros exportados.")
@@ -0,0 +1,57 @@
+import streamlit as st
+import pandas as pd
+import busca
+import consultas
+from db import get_pool, get_reader
+from paginacao import ORDENACOES, montar_consulta
+from schema import INDEXES
+
+get_pool()
+conn = get_reader()
+
+st.set_page_config(page_title="Plano de Consultas", layout="wide")
+st.title("🔍 Plano de Consultas")
+st.markdown("Resultado de `EXPLAIN QUERY PLAN` para cada consulta do dashboard. "
+            "Passos `SCAN` sem índice percorrem a tabela inteira e ficam destacados.")
+st.divider()
+
+
+def full_scan(detalhe: str) -> bool:
+    # "SCAN livros" é varredura completa; "SCAN ... USING (COVERING) INDEX" não lê a tabela
+    return detalhe.startswith("SCAN ") and " INDEX " not in f"{detalhe} "
+
+
+# Índices gerenciados e se já existem no banco
+existentes = set(pd.read_sql_query(
+    "SELECT name FROM sqlite_master WHERE type = 'index'", conn
+)["name"])
+st.subheader("Índices gerenciados")
+st.dataframe(pd.DataFrame({
+    "Índice": list(INDEXES),
+    "Definição": list(INDEXES.values()),
+    "Criado": [nome in existentes for nome in INDEXES],
+}))
+
+# Além das consultas fixas, audita as buscas e a tabela paginada em cada ordenação (segunda página)
+auditadas = dict(consultas.CONSULTAS)
+auditadas["Busca de livros (FTS5)"] = (busca.BUSCA_LIVROS, (busca.expressao_fts("harry"), busca.LIMITE_SUGESTOES))
+auditadas["Busca de autores (FTS5)"] = (busca.BUSCA_AUTORES, (busca.expressao_fts("king"), busca.LIMITE_SUGESTOES))
+for ordem in ORDENACOES:
+    depois = (0, 0) if ordem in ("ID", "Ano") else ("", 0)
+    auditadas[f"Catálogo paginado por {ordem}"] = montar_consulta(ordem, False, "", depois, 25)
+
+st.divider()
+for nome, (sql, params) in auditadas.items():
+    plano = pd.read_sql_query(f"EXPLAIN QUERY PLAN {sql}", conn, params=params)
+    scans = plano[plano["detail"].map(full_scan)]
+    icone = "⚠️" if not scans.empty else "✅"
+    with st.expander(f"{icone} {nome}", expanded=not scans.empty):
+        st.code(sql.strip(), language="sql")
+        st.dataframe(
+            plano[["id", "parent", "detail"]].style.apply(
+                lambda linha: ["background-color: #f8d7da" if full_scan(linha["detail"]) else ""] * len(linha),
+                axis=1
+            )
+        )
+        if not scans.empty:
+            st.warning("Varredura completa em: " + ", ".join(scans["detail"]))
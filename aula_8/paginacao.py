@@ -0,0 +1,87 @@
+import pandas as pd
+import streamlit as st
+
+from db import query
+
+# Colunas que podem ordenar a tabela: rótulo -> expressão SQL.
+# O desempate é sempre por l.id, para que a chave (coluna, id) seja única.
+ORDENACOES = {
+    "ID": "l.id",
+    "Título": "l.titulo",
+    "Autor": "a.nome",
+    "Categoria": "c.nome",
+    "Ano": "l.ano",
+}
+
+
+def montar_consulta(ordem: str, decrescente: bool, busca: str, depois: tuple, tamanho: int) -> tuple:
+    """Monta o SQL e os parâmetros de uma página do catálogo (paginação keyset).
+
+    ``depois`` é a chave (valor da coluna de ordenação, id) da última linha da
+    página anterior; a consulta continua a partir dela com ``WHERE (col, id) > (?, ?)``
+    em vez de OFFSET, então o custo não cresce com o número da página.
+    Retorna até ``tamanho + 1`` linhas: a linha extra indica que existe próxima página.
+    """
+    coluna = ORDENACOES[ordem]
+    direcao, comparacao = ("DESC", "<") if decrescente else ("ASC", ">")
+    filtros, params = [], []
+    if busca:
+        filtros.append("(l.titulo LIKE ? OR a.nome LIKE ? OR c.nome LIKE ?)")
+        params += [f"%{busca}%"] * 3
+    if depois is not None:
+        filtros.append(f"({coluna}, l.id) {comparacao} (?, ?)")
+        params += list(depois)
+    where = f"WHERE {' AND '.join(filtros)}" if filtros else ""
+    sql = f"""
+    SELECT
+        l.id,
+        l.titulo,
+        a.nome      AS Autor,
+        c.nome      AS Categoria,
+        l.ano,
+        {coluna}    AS chave
+    FROM livros l
+    JOIN autores a ON l.autor_id = a.id
+    JOIN categorias c ON l.categoria_id = c.id
+    {where}
+    ORDER BY {coluna} {direcao}, l.id {direcao}
+    LIMIT ?
+    """
+    return sql, tuple(params) + (tamanho + 1,)
+
+
+def buscar_pagina(ordem: str, decrescente: bool, busca: str, depois: tuple, tamanho: int) -> pd.DataFrame:
+    return query(*montar_consulta(ordem, decrescente, busca, depois, tamanho))
+
+
+def tabela_paginada(key: str, tamanho_padrao: int = 25):
+    """Tabela do catálogo com busca, ordenação e paginação feitas no banco."""
+    c1, c2, c3, c4 = st.columns([3, 2, 1, 1])
+    busca = c1.text_input("Buscar por título, autor ou categoria", key=f"{key}_busca").strip()
+    ordem = c2.selectbox("Ordenar por", list(ORDENACOES), key=f"{key}_ordem")
+    decrescente = c3.toggle("Decrescente", key=f"{key}_desc")
+    tamanho = c4.selectbox("Por página", [10, 25, 50, 100], index=[10, 25, 50, 100].index(tamanho_padrao),
+                           key=f"{key}_tamanho")
+
+    # Pilha com a chave de início de cada página visitada; zera quando o filtro muda
+    assinatura = (busca, ordem, decrescente, tamanho)
+    if st.session_state.get(f"{key}_assinatura") != assinatura:
+        st.session_state[f"{key}_assinatura"] = assinatura
+        st.session_state[f"{key}_cursores"] = [None]
+    cursores = st.session_state[f"{key}_cursores"]
+
+    pagina = buscar_pagina(ordem, decrescente, busca, cursores[-1], tamanho)
+    tem_proxima = len(pagina) > tamanho
+    pagina = pagina.iloc[:tamanho]
+
+    st.dataframe(pagina.drop(columns="chave"), hide_index=True)
+
+    n1, n2, n3 = st.columns([1, 1, 4])
+    if n1.button("◀ Anterior", key=f"{key}_anterior", disabled=len(cursores) == 1):
+        cursores.pop()
+        st.rerun()
+    if n2.button("Próxima ▶", key=f"{key}_proxima", disabled=not tem_proxima):
+        # tolist() devolve tipos nativos do Python, que o sqlite3 sabe vincular
+        cursores.append((pagina["chave"].tolist()[-1], int(pagina["id"].iloc[-1])))
+        st.rerun()
+    n3.caption(f"Página {len(cursores)}")
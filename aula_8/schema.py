@@ -0,0 +1,314 @@
+import sqlite3
+from contextlib import closing
+
+# Migrações versionadas do banco da biblioteca.
+# A versão aplicada fica gravada em PRAGMA user_version; cada migração roda
+# uma única vez, dentro de uma transação, e nas execuções seguintes nada é feito.
+
+
+def _criar_tabelas(cursor: sqlite3.Cursor):
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS autores (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        nome TEXT NOT NULL
+    )
+    ''')
+
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS categorias (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        nome TEXT NOT NULL
+    )
+    ''')
+
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS livros (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        titulo TEXT NOT NULL,
+        autor_id INTEGER NOT NULL,
+        categoria_id INTEGER NOT NULL,
+        ano INTEGER NOT NULL,
+        quantidade_disponivel INTEGER NOT NULL,
+        FOREIGN KEY (autor_id) REFERENCES autores(id),
+        FOREIGN KEY (categoria_id) REFERENCES categorias(id)
+    )
+    ''')
+
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS emprestimos (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        livro_id INTEGER NOT NULL,
+        data_emprestimo TEXT NOT NULL,
+        devolvido boolean NOT NULL,
+        FOREIGN KEY (livro_id) REFERENCES livros(id)
+    )
+    ''')
+
+
+# Empréstimos da carga fictícia: (livro_id, data_emprestimo, devolvido)
+EMPRESTIMOS_FICTICIOS = [
+    (1, "2025-05-27", 0),
+    (2, "2025-05-26", 1),
+    (3, "2025-05-25", 0),
+    (4, "2025-05-24", 1),
+    (5, "2025-05-23", 0),
+    (6, "2025-05-22", 1),
+    (7, "2025-05-21", 0),
+    (8, "2025-05-20", 1),
+    (9, "2025-05-19", 0),
+    (10, "2025-05-18", 1)
+]
+
+
+def _inserir_dados_ficticios(cursor: sqlite3.Cursor):
+    # Só popula tabelas vazias, para não duplicar dados de bancos já existentes
+
+    # Exemplo para inserção dos autores
+    cursor.execute("SELECT COUNT(*) FROM autores")
+    if cursor.fetchone()[0] == 0:
+        autores = [
+            ("J.K. Rowling",),
+            ("George R. R. Martin",),
+            ("J.R.R. Tolkien",),
+            ("Agatha Christie",),
+            ("Stephen King",)
+        ]
+        cursor.executemany("INSERT INTO autores (nome) VALUES (?)", autores)
+
+    # Exemplo para inserção das categorias
+    cursor.execute("SELECT COUNT(*) FROM categorias")
+    if cursor.fetchone()[0] == 0:
+        categorias = [
+            ("Fantasia",),
+            ("Mistério",),
+            ("Terror",),
+            ("Ficção Científica",),
+            ("Romance",)
+        ]
+        cursor.executemany("INSERT INTO categorias (nome) VALUES (?)", categorias)
+
+    # Exemplo para inserção dos livros (pelo menos 10)
+    cursor.execute("SELECT COUNT(*) FROM livros")
+    if cursor.fetchone()[0] == 0:
+        livros = [
+            ("Harry Potter and the Sorcerer's Stone", 1, 1, 1997, 5),
+            ("Harry Potter and the Chamber of Secrets", 1, 1, 1998, 4),
+            ("A Game of Thrones", 2, 1, 1996, 3),
+            ("A Clash of Kings", 2, 1, 1998, 3),
+            ("The Hobbit", 3, 1, 1937, 6),
+            ("The Lord of the Rings", 3, 1, 1954, 5),
+            ("Murder on the Orient Express", 4, 2, 1934, 4),
+            ("And Then There Were None", 4, 2, 1939, 4),
+            ("The Shining", 5, 3, 1977, 5),
+            ("It", 5, 3, 1986, 4),
+            ("Carrie", 5, 3, 1974, 3),
+            ("Misery", 5, 3, 1987, 2)
+        ]
+        cursor.executemany("""
+            INSERT INTO livros (titulo, autor_id, categoria_id, ano, quantidade_disponivel)
+            VALUES (?, ?, ?, ?, ?)
+        """, livros)
+
+    # Exemplo para inserção dos empréstimos
+    cursor.execute("SELECT COUNT(*) FROM emprestimos")
+    if cursor.fetchone()[0] == 0:
+        cursor.executemany("""
+            INSERT INTO emprestimos (livro_id, data_emprestimo, devolvido)
+            VALUES (?, ?, ?)
+        """, EMPRESTIMOS_FICTICIOS)
+
+
+# Índices gerenciados: nome -> definição.
+# Ao incluir um índice novo, acrescente _criar_indices de novo em MIGRATIONS.
+# Cobrem os JOINs de livros com autores/categorias, o filtro por ano,
+# o agrupamento por categoria e as contagens de empréstimos devolvidos.
+INDEXES = {
+    "idx_livros_ano": "livros(ano)",
+    "idx_livros_titulo": "livros(titulo)",
+    "idx_livros_autor_id": "livros(autor_id)",
+    "idx_livros_categoria_id": "livros(categoria_id)",
+    "idx_emprestimos_livro_devolvido": "emprestimos(livro_id, devolvido)",
+    "idx_emprestimos_devolvido": "emprestimos(devolvido)",
+    "idx_emprestimos_devolvido_data": "emprestimos(devolvido, data_emprestimo)",
+}
+
+
+def _criar_indices(cursor: sqlite3.Cursor):
+    for nome, definicao in INDEXES.items():
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {nome} ON {definicao}")
+    # Atualiza as estatísticas usadas pelo planejador de consultas
+    cursor.execute("ANALYZE")
+
+
+def _criar_indices_de_busca(cursor: sqlite3.Cursor):
+    # Índices FTS5 de conteúdo externo sobre livros.titulo e autores.nome,
+    # mantidos em sincronia por triggers. remove_diacritics faz "misterio" achar "Mistério".
+    for tabela, coluna in (("livros", "titulo"), ("autores", "nome")):
+        fts = f"{tabela}_fts"
+        cursor.execute(f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+            {coluna}, content='{tabela}', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2'
+        )
+        """)
+        cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {tabela} BEGIN
+            INSERT INTO {fts}(rowid, {coluna}) VALUES (new.id, new.{coluna});
+        END
+        """)
+        cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {tabela} BEGIN
+            INSERT INTO {fts}({fts}, rowid, {coluna}) VALUES ('delete', old.id, old.{coluna});
+        END
+        """)
+        cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {coluna} ON {tabela} BEGIN
+            INSERT INTO {fts}({fts}, rowid, {coluna}) VALUES ('delete', old.id, old.{coluna});
+            INSERT INTO {fts}(rowid, {coluna}) VALUES (new.id, new.{coluna});
+        END
+        """)
+        # Indexa as linhas que já existiam
+        cursor.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+def _criar_totais(cursor: sqlite3.Cursor):
+    # Tabela de uma linha com os totais do dashboard, mantida por triggers,
+    # para que estoque e empréstimos sejam lidos em O(1) em vez de agregados
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS totais (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        estoque INTEGER NOT NULL,
+        emprestimos INTEGER NOT NULL,
+        devolvidos INTEGER NOT NULL,
+        emprestados INTEGER NOT NULL
+    )
+    """)
+    cursor.execute("""
+    INSERT OR REPLACE INTO totais (id, estoque, emprestimos, devolvidos, emprestados)
+    SELECT 1,
+        (SELECT COALESCE(SUM(quantidade_disponivel), 0) FROM livros),
+        COUNT(*),
+        COALESCE(SUM(devolvido = 1), 0),
+        COALESCE(SUM(devolvido = 0), 0)
+    FROM emprestimos
+    """)
+    gatilhos = {
+        "livros_totais_ai": """AFTER INSERT ON livros BEGIN
+            UPDATE totais SET estoque = estoque + new.quantidade_disponivel;
+        END""",
+        "livros_totais_ad": """AFTER DELETE ON livros BEGIN
+            UPDATE totais SET estoque = estoque - old.quantidade_disponivel;
+        END""",
+        "livros_totais_au": """AFTER UPDATE OF quantidade_disponivel ON livros BEGIN
+            UPDATE totais SET estoque = estoque + new.quantidade_disponivel - old.quantidade_disponivel;
+        END""",
+        "emprestimos_totais_ai": """AFTER INSERT ON emprestimos BEGIN
+            UPDATE totais SET emprestimos = emprestimos + 1,
+                devolvidos = devolvidos + (new.devolvido = 1),
+                emprestados = emprestados + (new.devolvido = 0);
+        END""",
+        "emprestimos_totais_ad": """AFTER DELETE ON emprestimos BEGIN
+            UPDATE totais SET emprestimos = emprestimos - 1,
+                devolvidos = devolvidos - (old.devolvido = 1),
+                emprestados = emprestados - (old.devolvido = 0);
+        END""",
+        "emprestimos_totais_au": """AFTER UPDATE OF devolvido ON emprestimos BEGIN
+            UPDATE totais SET devolvidos = devolvidos + (new.devolvido = 1) - (old.devolvido = 1),
+                emprestados = emprestados + (new.devolvido = 0) - (old.devolvido = 0);
+        END""",
+    }
+    for nome, corpo in gatilhos.items():
+        cursor.execute(f"CREATE TRIGGER IF NOT EXISTS {nome} {corpo}")
+
+
+def _baixar_emprestimos_ficticios(cursor: sqlite3.Cursor):
+    # Os empréstimos fictícios em aberto entraram sem baixa no estoque (e, se já
+    # foram devolvidos pelo formulário, a devolução somou um exemplar que nunca
+    # saiu). Nos dois casos falta tirar um exemplar do livro; o trigger de
+    # livros acerta o estoque em "totais". Bancos sem a carga fictícia não mudam.
+    for livro_id, data_emprestimo, devolvido in EMPRESTIMOS_FICTICIOS:
+        if devolvido:
+            continue
+        cursor.execute("""
+            UPDATE livros SET quantidade_disponivel = quantidade_disponivel - 1
+            WHERE id = ? AND quantidade_disponivel > 0
+              AND EXISTS (SELECT 1 FROM emprestimos WHERE livro_id = ? AND data_emprestimo = ?)
+        """, (livro_id, livro_id, data_emprestimo))
+
+
+def _contar_emprestados_do_acervo(cursor: sqlite3.Cursor):
+    # Exemplares emprestados de livros que ainda existem: deletar um livro deixa
+    # os empréstimos dele no banco, e esses não podem somar no total do acervo
+    cursor.execute("ALTER TABLE totais ADD COLUMN acervo_emprestado INTEGER NOT NULL DEFAULT 0")
+    cursor.execute("""
+    UPDATE totais SET acervo_emprestado = (
+        SELECT COUNT(*) FROM emprestimos e JOIN livros l ON l.id = e.livro_id
+        WHERE e.devolvido = 0
+    )
+    """)
+    no_acervo = "EXISTS (SELECT 1 FROM livros WHERE id = {}.livro_id)"
+    abertos = "(SELECT COUNT(*) FROM emprestimos WHERE livro_id = {}.id AND devolvido = 0)"
+    gatilhos = {
+        "livros_acervo_ai": f"""AFTER INSERT ON livros BEGIN
+            UPDATE totais SET acervo_emprestado = acervo_emprestado + {abertos.format('new')};
+        END""",
+        "livros_acervo_ad": f"""AFTER DELETE ON livros BEGIN
+            UPDATE totais SET acervo_emprestado = acervo_emprestado - {abertos.format('old')};
+        END""",
+        "emprestimos_acervo_ai": f"""AFTER INSERT ON emprestimos BEGIN
+            UPDATE totais SET acervo_emprestado = acervo_emprestado
+                + ((new.devolvido = 0) AND {no_acervo.format('new')});
+        END""",
+        "emprestimos_acervo_ad": f"""AFTER DELETE ON emprestimos BEGIN
+            UPDATE totais SET acervo_emprestado = acervo_emprestado
+                - ((old.devolvido = 0) AND {no_acervo.format('old')});
+        END""",
+        "emprestimos_acervo_au": f"""AFTER UPDATE OF devolvido ON emprestimos BEGIN
+            UPDATE totais SET acervo_emprestado = acervo_emprestado
+                + ((new.devolvido = 0) - (old.devolvido = 0)) * {no_acervo.format('new')};
+        END""",
+    }
+    for nome, corpo in gatilhos.items():
+        cursor.execute(f"CREATE TRIGGER IF NOT EXISTS {nome} {corpo}")
+
+
+# Tabelas alteradas por triggers quando a tabela da chave é escrita.
+# O pool usa este mapa para invalidar também as leituras em cache dessas tabelas.
+TRIGGER_TARGETS = {
+    "livros": ("livros_fts", "totais"),
+    "autores": ("autores_fts",),
+    "emprestimos": ("totais",),
+}
+
+
+# A posição na lista é a versão do schema: MIGRATIONS[0] leva o banco à versão 1
+MIGRATIONS = [
+    _criar_tabelas,
+    _inserir_dados_ficticios,
+    _criar_indices,
+    _criar_indices,  # idx_livros_titulo, para a paginação ordenada por título
+    _criar_indices_de_busca,
+    _criar_totais,
+    _criar_indices,  # idx_emprestimos_devolvido_data, para contar os atrasados
+    _baixar_emprestimos_ficticios,
+    _contar_emprestados_do_acervo,
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def get_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(pool):
+    """Aplica as migrações pendentes usando o escritor do pool."""
+    with closing(pool.open_reader()) as conn:
+        if get_version(conn) >= SCHEMA_VERSION:
+            return
+    with pool.writer() as cursor:
+        atual = get_version(cursor.connection)
+        for versao, migracao in enumerate(MIGRATIONS[atual:], start=atual + 1):
+            migracao(cursor)
+            # PRAGMA não aceita parâmetros; a versão é sempre um int nosso
+            cursor.execute(f"PRAGMA user_version = {versao:d}")
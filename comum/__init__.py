@@ -0,0 +1,3 @@
+# Módulos compartilhados pelos dashboards das aulas.
+# Os scripts são executados com `streamlit run aula_X/...` a partir da raiz
+# do repositório e acrescentam a raiz ao sys.path para importar este pacote.
@@ -0,0 +1,100 @@
+import hashlib
+import os
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:  # sem pyarrow, lê o CSV direto
+    pa = feather = None
+
+# Pasta (ao lado de cada CSV) onde ficam as cópias colunares
+PASTA_CACHE = '.cache_colunar'
+
+
+def caminho_cache(csv_path: str) -> Path:
+    csv = Path(csv_path)
+    return csv.parent / PASTA_CACHE / f"{csv.stem}.feather"
+
+
+@lru_cache(maxsize=32)
+def _hash_arquivo(path: str, mtime_ns: int, tamanho: int) -> str:
+    # Só é recalculado quando a data de modificação ou o tamanho mudam
+    sha = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for bloco in iter(lambda: f.read(1 << 20), b''):
+            sha.update(bloco)
+    return sha.hexdigest()
+
+
+def versao_arquivo(path: str) -> str:
+    """Identifica a versão do arquivo por mtime, tamanho e hash do conteúdo."""
+    info = os.stat(path)
+    return f"{info.st_mtime_ns}-{info.st_size}-{_hash_arquivo(path, info.st_mtime_ns, info.st_size)}"
+
+
+def _assinatura(csv_path: str, opcoes: dict) -> str:
+    # Muda quando o CSV é alterado ou quando as opções de leitura (dtypes etc.) mudam
+    info = os.stat(csv_path)
+    opcoes_hash = hashlib.sha1(repr(sorted(opcoes.items(), key=str)).encode()).hexdigest()[:12]
+    return f"{info.st_mtime_ns}-{info.st_size}-{opcoes_hash}"
+
+
+def _cache_valido(destino: Path, assinatura: str) -> bool:
+    if not destino.exists():
+        return False
+    metadados = feather.read_table(destino, columns=[], memory_map=True).schema.metadata or {}
+    return metadados.get(b'origem') == assinatura.encode()
+
+
+def gravar_feather(df: pd.DataFrame, destino: Path, assinatura: str):
+    """Grava ``df`` em Feather com ``assinatura`` nos metadados (lida de volta por ``ler_feather``)."""
+    if feather is None:
+        return
+    tabela = pa.Table.from_pandas(df, preserve_index=False)
+    tabela = tabela.replace_schema_metadata({**(tabela.schema.metadata or {}), b'origem': assinatura.encode()})
+    destino.parent.mkdir(parents=True, exist_ok=True)
+    # Grava em arquivo temporário e troca de uma vez, para nenhum leitor ver um arquivo pela metade.
+    # O nome é único por gravação: sessões do Streamlit são threads do mesmo processo.
+    # Sem compressão, para que a leitura possa mapear o arquivo na memória.
+    with tempfile.NamedTemporaryFile(dir=destino.parent, prefix=destino.name, suffix='.tmp',
+                                     delete=False) as temporario:
+        pass
+    try:
+        feather.write_feather(tabela, temporario.name, compression='uncompressed')
+        os.replace(temporario.name, destino)
+    except BaseException:
+        os.remove(temporario.name)
+        raise
+
+
+def ler_feather(destino: Path, assinatura: str, colunas: list = None):
+    """DataFrame gravado por ``gravar_feather``, ou None se não existe ou a assinatura mudou."""
+    if feather is None or not _cache_valido(destino, assinatura):
+        return None
+    return feather.read_table(destino, columns=colunas, memory_map=True).to_pandas()
+
+
+def _converter(csv_path: str, destino: Path, assinatura: str, opcoes: dict):
+    gravar_feather(pd.read_csv(csv_path, **opcoes), destino, assinatura)
+
+
+def ler_tabela(csv_path: str, colunas: list = None, **opcoes) -> pd.DataFrame:
+    """Lê um CSV através de uma cópia colunar em Feather (Arrow IPC).
+
+    Na primeira leitura (ou quando o CSV ou as ``opcoes`` do ``pd.read_csv``
+    mudam) o arquivo inteiro é convertido, já com os dtypes aplicados. Depois,
+    o Feather é mapeado na memória e só as ``colunas`` pedidas são carregadas.
+    """
+    if feather is None:
+        return pd.read_csv(csv_path, usecols=colunas, **opcoes)
+
+    destino = caminho_cache(csv_path)
+    assinatura = _assinatura(csv_path, opcoes)
+    if not _cache_valido(destino, assinatura):
+        _converter(csv_path, destino, assinatura, opcoes)
+    return feather.read_table(destino, columns=colunas, memory_map=True).to_pandas()
@@ -0,0 +1,82 @@
+from typing import NamedTuple
+
+import pandas as pd
+
+from comum.colunar import ler_tabela
+
+
+class Coluna(NamedTuple):
+    nome: str             # nome canônico, já normalizado
+    dtype: object
+    unidade: str = ''
+    minimo: float = None  # faixa esperada dos valores (None = sem limite)
+    maximo: float = None
+
+
+class Esquema(NamedTuple):
+    nome: str
+    colunas: tuple
+
+    @property
+    def nomes(self) -> list:
+        return [c.nome for c in self.colunas]
+
+    def __getitem__(self, nome: str) -> Coluna:
+        for coluna in self.colunas:
+            if coluna.nome == nome:
+                return coluna
+        raise KeyError(nome)
+
+
+class ErroDeEsquema(Exception):
+    """O arquivo não corresponde ao esquema declarado (coluna ausente ou tipo incompatível)."""
+
+
+def normalizar(nome: str) -> str:
+    """Tira espaços nas bordas e colapsa espaços repetidos: ' thinness  1-19 years' -> 'thinness 1-19 years'."""
+    return ' '.join(str(nome).split())
+
+
+def ler_com_esquema(csv_path: str, esquema: Esquema, **opcoes) -> pd.DataFrame:
+    """Lê só as colunas do ``esquema``, já com os dtypes declarados e os nomes canônicos.
+
+    O cabeçalho do arquivo é normalizado e casado com os nomes canônicos antes
+    da leitura; a leitura em si usa ``usecols`` e o mapa de dtypes (pela cópia
+    colunar de ``ler_tabela``). Coluna ausente ou valor incompatível com o
+    dtype levanta ``ErroDeEsquema`` em vez de quebrar adiante na página.
+    """
+    cabecalho = pd.read_csv(csv_path, nrows=0, **opcoes).columns
+    originais = {normalizar(c): c for c in cabecalho}
+    ausentes = [nome for nome in esquema.nomes if nome not in originais]
+    if ausentes:
+        raise ErroDeEsquema(
+            f"{csv_path}: colunas do esquema '{esquema.nome}' não encontradas: {ausentes}. "
+            f"Cabeçalho atual: {[normalizar(c) for c in cabecalho]}"
+        )
+
+    usecols = [originais[c.nome] for c in esquema.colunas]
+    dtype = {originais[c.nome]: c.dtype for c in esquema.colunas}
+    try:
+        df = ler_tabela(csv_path, usecols=usecols, dtype=dtype, **opcoes)
+    except (ValueError, TypeError) as erro:
+        raise ErroDeEsquema(f"{csv_path}: valores incompatíveis com o esquema '{esquema.nome}': {erro}") from erro
+    df = df.rename(columns={original: normalizar(original) for original in usecols})
+    return df[esquema.nomes]
+
+
+def fora_da_faixa(df: pd.DataFrame, esquema: Esquema) -> pd.DataFrame:
+    """Quantidade de valores fora da faixa declarada, por coluna (só as que têm algum)."""
+    linhas = []
+    for c in esquema.colunas:
+        if c.minimo is None and c.maximo is None:
+            continue
+        serie = df[c.nome]
+        fora = pd.Series(False, index=serie.index)
+        if c.minimo is not None:
+            fora |= serie < c.minimo
+        if c.maximo is not None:
+            fora |= serie > c.maximo
+        if fora.any():
+            linhas.append({'Coluna': c.nome, 'Unidade': c.unidade, 'Mínimo': c.minimo,
+                           'Máximo': c.maximo, 'Fora da faixa': int(fora.sum())})
+    return pd.DataFrame(linhas, columns=['Coluna', 'Unidade', 'Mínimo', 'Máximo', 'Fora da faixa'])
@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+# Classes do histograma da moda quando a coluna é float e não há passo declarado
+BINS_MODA = 256
+# Acima dessa amplitude, colunas inteiras também usam o histograma
+MAX_CONTAGEM = 1 << 20
+
+CAMPOS = ['n', 'media', 'mediana', 'moda', 'variancia', 'desvio_padrao',
+          'minimo', 'maximo', 'amplitude', 'q1', 'q3']
+
+
+def _moda(valores: np.ndarray, minimo: float, maximo: float, passo: float = None) -> float:
+    """Moda por contagem em classes, sem ordenar a coluna.
+
+    Inteiros (ou floats com ``passo`` declarado, ex.: notas com uma casa
+    decimal → 0.1) caem cada um na sua classe e a moda é exata. Nos demais
+    floats a moda é o centro da classe mais cheia de um histograma de
+    ``BINS_MODA`` classes. Empates ficam com o menor valor, como no ``mode()``.
+    """
+    if len(valores) == 0:
+        return np.nan
+    if passo is None and np.issubdtype(valores.dtype, np.integer) and maximo - minimo < MAX_CONTAGEM:
+        passo = 1
+    if passo is not None:
+        classes = np.rint((valores - minimo) / passo).astype(np.int64)
+        # Arredonda para não exibir resíduos de ponto flutuante (6.700000000000001)
+        return round(float(minimo + np.argmax(np.bincount(classes)) * passo), 10)
+    if minimo == maximo:
+        return float(minimo)
+    largura = (maximo - minimo) / BINS_MODA
+    classes = np.minimum(((valores - minimo) / largura).astype(np.int64), BINS_MODA - 1)
+    return float(minimo + (np.argmax(np.bincount(classes, minlength=BINS_MODA)) + 0.5) * largura)
+
+
+def descrever(df: pd.DataFrame, colunas: list, passos: dict = None) -> pd.DataFrame:
+    """Estatísticas descritivas de ``colunas`` (uma linha por coluna, ``CAMPOS`` nas colunas).
+
+    As colunas viram uma matriz só: momentos por somas sobre o eixo das linhas
+    e mediana/quartis por ``np.quantile`` (seleção parcial, sem ordenação
+    completa). Variância e desvio padrão amostrais (ddof=1), como no pandas;
+    valores faltantes são ignorados.
+    """
+    passos = passos or {}
+    matriz = df[colunas].to_numpy(dtype=np.float64)
+    presente = ~np.isnan(matriz)
+    completa = presente.all()
+
+    n = presente.sum(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        media = np.where(presente, matriz, 0.0).sum(axis=0) / n
+        desvios = np.where(presente, matriz - media, 0.0)
+        variancia = (desvios * desvios).sum(axis=0) / (n - 1)
+    if completa:
+        minimo, maximo = matriz.min(axis=0), matriz.max(axis=0)
+        q1, mediana, q3 = np.quantile(matriz, [0.25, 0.5, 0.75], axis=0)
+    else:
+        minimo, maximo = np.nanmin(matriz, axis=0), np.nanmax(matriz, axis=0)
+        q1, mediana, q3 = np.nanquantile(matriz, [0.25, 0.5, 0.75], axis=0)
+
+    moda = [
+        _moda(df[c].to_numpy()[presente[:, k]], minimo[k], maximo[k], passos.get(c))
+        for k, c in enumerate(colunas)
+    ]
+    return pd.DataFrame({
+        'n': n, 'media': media, 'mediana': mediana, 'moda': moda,
+        'variancia': variancia, 'desvio_padrao': np.sqrt(variancia),
+        'minimo': minimo, 'maximo': maximo, 'amplitude': maximo - minimo,
+        'q1': q1, 'q3': q3,
+    }, index=pd.Index(colunas, name='coluna'))
+
+
+# Pequeno e imutável: cache_data por versão do arquivo
+@st.cache_data(show_spinner=False, max_entries=16)
+def estatisticas(_df: pd.DataFrame, colunas: tuple, versao: str, passos: dict = None) -> pd.DataFrame:
+    return descrever(_df, list(colunas), passos)
+
+
+def linha_metricas(resumo: pd.Series, metricas: list):
+    """Uma linha de ``st.metric``, uma por ``(rótulo, campo, formato)`` de ``metricas``.
+
+    ``formato`` é uma string de ``str.format`` ou uma função que recebe o valor.
+
+    Ex.: ``linha_metricas(stats.loc['idade'], [("Média Idade", 'media', '{:.2f}')])``.
+    """
+    for coluna, (rotulo, campo, formato) in zip(st.columns(len(metricas)), metricas):
+        valor = resumo[campo]
+        coluna.metric(rotulo, formato(valor) if callable(formato) else formato.format(valor))
@@ -0,0 +1,38 @@
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+
+class Faixas(NamedTuple):
+    """Faixas declaradas pelas bordas, como no ``pd.cut``.
+
+    ``bordas`` tem um elemento a mais que ``rotulos``; use ``-np.inf``/``np.inf``
+    para faixas abertas. Com ``direita=True`` as faixas são ``(a, b]``; com
+    ``direita=False``, ``[a, b)``. Valores fora das bordas (e NaN) ficam sem faixa.
+
+    Ex.: ``Faixas((-np.inf, 25, 45, np.inf), ('Jovem', 'Adulto', 'Sênior'))``
+    equivale a ``idade <= 25 → Jovem``, ``<= 45 → Adulto``, senão ``Sênior``.
+    """
+    bordas: tuple
+    rotulos: tuple
+    direita: bool = True
+
+    @property
+    def tipo(self) -> pd.CategoricalDtype:
+        return pd.CategoricalDtype(list(self.rotulos), ordered=True)
+
+    def codigos(self, valores) -> np.ndarray:
+        """Índice da faixa de cada valor (-1 quando fora das bordas), por ``np.searchsorted``."""
+        valores = np.asarray(valores, dtype=np.float64)
+        codigos = np.searchsorted(np.asarray(self.bordas, dtype=np.float64), valores,
+                                  side='left' if self.direita else 'right') - 1
+        codigos[(codigos < 0) | (codigos >= len(self.rotulos))] = -1
+        return codigos
+
+    def classificar(self, valores):
+        """Faixa de cada valor, como categórica ordenada (Series se ``valores`` for Series)."""
+        categorias = pd.Categorical.from_codes(self.codigos(valores), dtype=self.tipo)
+        if isinstance(valores, pd.Series):
+            return pd.Series(categorias, index=valores.index, name=valores.name)
+        return categorias
@@ -0,0 +1,70 @@
+import io
+import threading
+from collections import OrderedDict
+
+import matplotlib.pyplot as plt
+import streamlit as st
+
+MAX_GRAFICOS = 128
+# Mesmos padrões do st.pyplot
+DPI = 200
+
+# O estado do pyplot é global ao processo; sessões diferentes não desenham ao mesmo tempo
+_desenho = threading.Lock()
+
+
+class CacheGraficos:
+    """Imagens já renderizadas, por chave, com descarte do menos usado (LRU)."""
+
+    def __init__(self, maximo: int = MAX_GRAFICOS):
+        self.maximo = maximo
+        self._imagens = OrderedDict()
+        self._lock = threading.Lock()
+
+    def obter(self, chave, renderizar):
+        with self._lock:
+            if chave in self._imagens:
+                self._imagens.move_to_end(chave)
+                return self._imagens[chave]
+        imagem = renderizar()
+        with self._lock:
+            self._imagens[chave] = imagem
+            self._imagens.move_to_end(chave)
+            while len(self._imagens) > self.maximo:
+                self._imagens.popitem(last=False)
+        return imagem
+
+    def __len__(self):
+        return len(self._imagens)
+
+
+@st.cache_resource(show_spinner=False)
+def cache_graficos() -> CacheGraficos:
+    # Um cache por processo, compartilhado entre sessões
+    return CacheGraficos()
+
+
+def renderizar(desenhar, formato: str = 'png', dpi: int = DPI):
+    """Chama ``desenhar()`` (que devolve uma Figure) e converte para bytes (PNG) ou texto (SVG).
+
+    A figura é sempre fechada, mesmo se o desenho ou a conversão falhar.
+    """
+    with _desenho:
+        figura = desenhar()
+        try:
+            buffer = io.BytesIO()
+            figura.savefig(buffer, format=formato, dpi=dpi, bbox_inches='tight')
+        finally:
+            plt.close(figura)
+    dados = buffer.getvalue()
+    return dados.decode('utf-8') if formato == 'svg' else dados
+
+
+def mostrar_grafico(desenhar, versao, *spec, formato: str = 'png', width='stretch'):
+    """Mostra o gráfico de ``desenhar()``, renderizado uma vez por (versão dos dados, spec).
+
+    ``spec`` identifica o gráfico e todos os parâmetros que mudam o desenho
+    (coluna, filtro etc.); nas próximas execuções a imagem vem do cache.
+    """
+    imagem = cache_graficos().obter((versao, spec, formato), lambda: renderizar(desenhar, formato))
+    st.image(imagem, width=width)
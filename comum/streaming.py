@@ -0,0 +1,319 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from comum.estatistica import CAMPOS
+
+# CSVs maiores que isso são lidos em blocos, sem carregar o arquivo inteiro
+LIMITE_BYTES = int(os.environ.get('LIMITE_MEMORIA_MB', 512)) * (1 << 20)
+TAMANHO_BLOCO = 200_000
+
+
+def usar_streaming(csv_path: str) -> bool:
+    return os.path.getsize(csv_path) > LIMITE_BYTES
+
+
+def varrer(csv_path: str, acumuladores: list, colunas: list = None, preparar=None,
+           tamanho_bloco: int = TAMANHO_BLOCO, **opcoes) -> list:
+    """Lê o CSV em blocos de ``tamanho_bloco`` linhas e passa cada bloco a todos os ``acumuladores``.
+
+    ``preparar`` (opcional) recebe o bloco e devolve o bloco com colunas
+    derivadas. Só um bloco fica na memória por vez.
+    """
+    for bloco in pd.read_csv(csv_path, usecols=colunas, chunksize=tamanho_bloco, **opcoes):
+        if preparar is not None:
+            bloco = preparar(bloco)
+        for acumulador in acumuladores:
+            acumulador.adicionar(bloco)
+    return acumuladores
+
+
+class Momentos:
+    """Contagem, média, variância, mínimo e máximo por coluna (e por ``grupo``, se dado).
+
+    Cada bloco é resumido por um groupby e juntado ao acumulado pela fórmula de
+    Chan (Welford em paralelo), que não perde precisão como somas de quadrados.
+    Sem ``grupo`` os resultados são Series por coluna; com ``grupo``,
+    DataFrames grupo × coluna.
+    """
+
+    def __init__(self, colunas: list, grupo: str = None):
+        self.colunas = list(colunas)
+        self.grupo = grupo
+        self.n = self._media = self._m2 = self._minimo = self._maximo = None
+
+    def adicionar(self, bloco: pd.DataFrame):
+        chaves = bloco[self.grupo] if self.grupo else np.zeros(len(bloco), dtype=np.int8)
+        grupos = bloco[self.colunas].groupby(chaves, observed=True, sort=False)
+        n = grupos.count()
+        self._juntar(n, grupos.mean(), (grupos.var(ddof=0) * n).fillna(0.0), grupos.min(), grupos.max())
+
+    def _juntar(self, n, media, m2, minimo, maximo):
+        if self.n is None:
+            self.n, self._media, self._m2, self._minimo, self._maximo = n, media, m2, minimo, maximo
+            return
+        indice = self.n.index.append(n.index).unique()
+        na, nb = self.n.reindex(indice, fill_value=0), n.reindex(indice, fill_value=0)
+        ma, mb = self._media.reindex(indice).fillna(0.0), media.reindex(indice).fillna(0.0)
+        total = na + nb
+        with np.errstate(invalid='ignore', divide='ignore'):
+            delta = mb - ma
+            self._media = (ma + delta * nb / total).where(total > 0)
+            self._m2 = (self._m2.reindex(indice).fillna(0.0) + m2.reindex(indice).fillna(0.0)
+                        + (delta * delta * na * nb / total).fillna(0.0))
+        self.n = total
+        self._minimo = np.fmin(self._minimo.reindex(indice), minimo.reindex(indice))
+        self._maximo = np.fmax(self._maximo.reindex(indice), maximo.reindex(indice))
+
+    def _saida(self, tabela: pd.DataFrame):
+        return tabela if self.grupo else tabela.iloc[0]
+
+    @property
+    def contagem(self):
+        return self._saida(self.n)
+
+    @property
+    def media(self):
+        return self._saida(self._media)
+
+    @property
+    def variancia(self):
+        # Amostral (ddof=1), como no pandas
+        return self._saida(self._m2 / (self.n - 1).where(self.n > 1))
+
+    @property
+    def desvio_padrao(self):
+        return np.sqrt(self.variancia)
+
+    @property
+    def minimo(self):
+        return self._saida(self._minimo)
+
+    @property
+    def maximo(self):
+        return self._saida(self._maximo)
+
+
+class TDigest:
+    """Resumo de quantis de tamanho fixo (t-digest por fusão), atualizado bloco a bloco.
+
+    Os valores viram centróides (média, peso); cada centróide cobre no máximo
+    uma unidade da escala ``k(q) = δ/2π · asin(2q − 1)``, o que deixa as
+    caudas com centróides pequenos (quantis extremos precisos) e o miolo com
+    centróides grandes. Guarda cerca de ``compressao / 2`` centróides.
+    """
+
+    def __init__(self, compressao: float = 200):
+        self.compressao = compressao
+        self.medias = np.empty(0)
+        self.pesos = np.empty(0)
+        self.minimo, self.maximo = np.inf, -np.inf
+
+    @property
+    def total(self) -> float:
+        return float(self.pesos.sum())
+
+    def adicionar(self, valores):
+        valores = np.asarray(valores, dtype=np.float64)
+        valores = valores[~np.isnan(valores)]
+        if len(valores) == 0:
+            return
+        self.minimo = min(self.minimo, valores.min())
+        self.maximo = max(self.maximo, valores.max())
+        self._fundir(np.concatenate([self.medias, valores]),
+                     np.concatenate([self.pesos, np.ones(len(valores))]))
+
+    def _fundir(self, medias: np.ndarray, pesos: np.ndarray):
+        ordem = np.argsort(medias, kind='stable')
+        medias, pesos = medias[ordem], pesos[ordem]
+        acumulado = np.cumsum(pesos)
+        q_inicio = (acumulado - pesos) / acumulado[-1]
+        k = self.compressao / (2 * np.pi) * np.arcsin(2 * q_inicio - 1)
+        grupo = np.floor(k - k[0]).astype(np.int64)
+        peso = np.bincount(grupo, weights=pesos)
+        soma = np.bincount(grupo, weights=pesos * medias)
+        usados = peso > 0
+        self.pesos = peso[usados]
+        self.medias = soma[usados] / self.pesos
+
+    def quantil(self, q):
+        """Quantil(is) ``q`` (0–1), interpolando entre os centróides e os extremos exatos."""
+        if len(self.pesos) == 0:
+            return np.full(np.shape(q), np.nan) if np.ndim(q) else np.nan
+        total = self.total
+        centros = np.cumsum(self.pesos) - self.pesos / 2
+        x = np.concatenate([[0.0], centros, [total]])
+        y = np.concatenate([[self.minimo], self.medias, [self.maximo]])
+        return np.interp(np.asarray(q) * total, x, y)
+
+
+class Quantis:
+    """Um ``TDigest`` por coluna."""
+
+    def __init__(self, colunas: list, compressao: float = 200):
+        self.digests = {c: TDigest(compressao) for c in colunas}
+
+    def adicionar(self, bloco: pd.DataFrame):
+        for coluna, digest in self.digests.items():
+            digest.adicionar(bloco[coluna].to_numpy(dtype=np.float64, na_value=np.nan))
+
+    def quantil(self, coluna: str, q):
+        return self.digests[coluna].quantil(q)
+
+
+class Contagens:
+    """Contagem exata de cada valor, por coluna (categorias e valores discretos, ex.: notas).
+
+    O estado cresce com o número de valores distintos: colunas contínuas vão em ``Quantis``.
+    """
+
+    def __init__(self, colunas: list):
+        self.tabelas = {c: pd.Series(dtype=np.int64) for c in colunas}
+
+    def adicionar(self, bloco: pd.DataFrame):
+        for coluna in self.tabelas:
+            self._somar(coluna, bloco[coluna].value_counts(sort=False))
+
+    def _somar(self, coluna: str, contagem: pd.Series):
+        self.tabelas[coluna] = self.tabelas[coluna].add(contagem, fill_value=0).astype(np.int64)
+
+    def contagens(self, coluna: str) -> pd.Series:
+        """Frequência de cada valor, da maior para a menor (como ``value_counts``)."""
+        return self.tabelas[coluna].sort_values(ascending=False, kind='stable')
+
+    def quantil(self, coluna: str, q):
+        """Quantil(is) exato(s) a partir das contagens (interpolação linear, como ``np.quantile``)."""
+        tabela = self.tabelas[coluna].sort_index()
+        valores = tabela.index.to_numpy(dtype=np.float64)
+        acumulado = np.cumsum(tabela.to_numpy())
+        if len(valores) == 0:
+            return np.full(np.shape(q), np.nan) if np.ndim(q) else np.nan
+        posicao = np.asarray(q) * (acumulado[-1] - 1)
+        abaixo = valores[np.searchsorted(acumulado, np.floor(posicao), side='right')]
+        acima = valores[np.searchsorted(acumulado, np.ceil(posicao), side='right')]
+        return abaixo + (acima - abaixo) * (posicao - np.floor(posicao))
+
+    def moda(self, coluna: str):
+        # Empates ficam com o menor valor, como no mode()
+        tabela = self.tabelas[coluna].sort_index()
+        return tabela.idxmax() if len(tabela) else np.nan
+
+
+class CoMomentos:
+    """Médias e co-momentos de ``colunas`` (linhas completas), para a matriz de Pearson.
+
+    Juntados entre blocos pela mesma fórmula de Chan dos ``Momentos``, em forma matricial.
+    """
+
+    def __init__(self, colunas: list):
+        self.colunas = list(colunas)
+        self.n = 0
+        self.media = np.zeros(len(self.colunas))
+        self.comomento = np.zeros((len(self.colunas), len(self.colunas)))
+
+    def adicionar(self, bloco: pd.DataFrame):
+        x = bloco[self.colunas].to_numpy(dtype=np.float64, na_value=np.nan)
+        x = x[~np.isnan(x).any(axis=1)]
+        if len(x) == 0:
+            return
+        media = x.mean(axis=0)
+        centrado = x - media
+        self._juntar(len(x), media, centrado.T @ centrado)
+
+    def _juntar(self, n: int, media: np.ndarray, comomento: np.ndarray):
+        total = self.n + n
+        delta = media - self.media
+        self.comomento = self.comomento + comomento + np.outer(delta, delta) * self.n * n / total
+        self.media = self.media + delta * n / total
+        self.n = total
+
+    def correlacao(self) -> pd.DataFrame:
+        with np.errstate(invalid='ignore', divide='ignore'):
+            desvio = np.sqrt(np.diag(self.comomento))
+            r = self.comomento / np.outer(desvio, desvio)
+        return pd.DataFrame(np.clip(r, -1.0, 1.0), index=self.colunas, columns=self.colunas)
+
+
+class Extremos:
+    """Linha com o maior e com o menor valor de cada coluna (a primeira, em caso de empate).
+
+    Guarda só ``rotulos`` dessas linhas (ex.: a cidade do aluno), como um
+    ``df.loc[df[coluna].idxmax(), rotulos]`` sobre o arquivo inteiro.
+    """
+
+    def __init__(self, colunas: list, rotulos: list):
+        self.rotulos = list(rotulos)
+        self.maior = {c: None for c in colunas}
+        self.menor = {c: None for c in colunas}
+
+    def adicionar(self, bloco: pd.DataFrame):
+        for coluna in self.maior:
+            serie = bloco[coluna]
+            if serie.notna().any():
+                self._trocar(self.maior, coluna, bloco.loc[serie.idxmax()], lambda novo, atual: novo > atual)
+                self._trocar(self.menor, coluna, bloco.loc[serie.idxmin()], lambda novo, atual: novo < atual)
+
+    def _trocar(self, extremos: dict, coluna: str, linha: pd.Series, melhor):
+        # Estritamente melhor: o empate fica com a linha que veio antes no arquivo
+        if extremos[coluna] is None or melhor(linha[coluna], extremos[coluna][coluna]):
+            extremos[coluna] = linha[[*self.rotulos, coluna]]
+
+
+class Amostra:
+    """Amostra aleatória uniforme de até ``tamanho`` linhas (reservatório), para os gráficos.
+
+    Cada linha recebe uma chave aleatória e ficam as ``tamanho`` menores, o
+    que equivale a sortear sem reposição entre todas as linhas já vistas.
+    """
+
+    def __init__(self, tamanho: int = 20_000, semente: int = 0):
+        self.tamanho = tamanho
+        self._rng = np.random.default_rng(semente)
+        self._chaves = np.empty(0)
+        self._linhas = None
+        self.vistas = 0
+
+    def adicionar(self, bloco: pd.DataFrame):
+        self.vistas += len(bloco)
+        chaves = self._rng.random(len(bloco))
+        if self._linhas is None:
+            self._manter(chaves, bloco)
+        else:
+            self._manter(np.concatenate([self._chaves, chaves]), pd.concat([self._linhas, bloco]))
+
+    def _manter(self, chaves: np.ndarray, linhas: pd.DataFrame):
+        if len(chaves) > self.tamanho:
+            menores = np.argpartition(chaves, self.tamanho)[:self.tamanho]
+            chaves, linhas = chaves[menores], linhas.iloc[menores]
+        self._chaves, self._linhas = chaves, linhas
+
+    @property
+    def dados(self) -> pd.DataFrame:
+        """Linhas sorteadas, na ordem do arquivo."""
+        return self._linhas.sort_index() if self._linhas is not None else pd.DataFrame()
+
+
+def resumo_descritivo(momentos: Momentos, quantis: Quantis = None, contagens: Contagens = None) -> pd.DataFrame:
+    """As mesmas estatísticas de ``comum.estatistica.descrever``, a partir dos acumuladores.
+
+    Colunas em ``contagens`` (valores discretos) têm moda, mediana e quartis
+    exatos; nas demais a mediana e os quartis vêm do t-digest em ``quantis``
+    (aproximados) e a moda fica em branco.
+    """
+    colunas = momentos.colunas
+    exatas = contagens.tabelas if contagens is not None else {}
+    q1, mediana, q3 = np.array([
+        contagens.quantil(c, [0.25, 0.5, 0.75]) if c in exatas
+        else quantis.quantil(c, [0.25, 0.5, 0.75]) if quantis is not None
+        else [np.nan] * 3
+        for c in colunas
+    ]).T
+    moda = [contagens.moda(c) if c in exatas else np.nan for c in colunas]
+    resumo = pd.DataFrame({
+        'n': momentos.contagem, 'media': momentos.media, 'mediana': mediana, 'moda': moda,
+        'variancia': momentos.variancia, 'desvio_padrao': momentos.desvio_padrao,
+        'minimo': momentos.minimo, 'maximo': momentos.maximo,
+        'amplitude': momentos.maximo - momentos.minimo, 'q1': q1, 'q3': q3,
+    }, index=pd.Index(colunas, name='coluna'))
+    return resumo[CAMPOS]